@@ -1,13 +1,13 @@
 from django.contrib import admin
 from django.http import HttpResponseRedirect
 from django.shortcuts import reverse
-from django.templatetags.static import static
 from django.utils.html import format_html
 from django.utils.http import url_has_allowed_host_and_scheme
 from star_burger import settings
 
 from .models import (
     Order,
+    OrderIntake,
     OrderItem,
     Product,
     ProductCategory,
@@ -32,6 +32,7 @@ class RestaurantAdmin(admin.ModelAdmin):
         'name',
         'address',
         'contact_phone',
+        'capacity',
     ]
     inlines = [
         RestaurantMenuItemInline
@@ -90,7 +91,7 @@ class ProductAdmin(admin.ModelAdmin):
     class Media:
         css = {
             "all": (
-                static("admin/foodcartapp.css")
+                "admin/foodcartapp.css",
             )
         }
 
@@ -123,6 +124,7 @@ class OrderAdmin(admin.ModelAdmin):
     inlines = [
         OrderItemInline
     ]
+    readonly_fields = ['total']
 
     def response_post_save_change(self, request, obj):
         res = super().response_post_save_change(request, obj)
@@ -133,3 +135,8 @@ class OrderAdmin(admin.ModelAdmin):
             return res
 
 
+@admin.register(OrderIntake)
+class OrderIntakeAdmin(admin.ModelAdmin):
+    list_display = ['id', 'accepted_at', 'processed_at', 'order', 'errors']
+    list_filter = ['processed_at']
+    raw_id_fields = ['order']
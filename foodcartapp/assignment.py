@@ -0,0 +1,196 @@
+import heapq
+import logging
+import time
+from collections import deque
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.utils.timezone import now
+
+from star_burger.metrics import ORDER_STATUS_TRANSITIONS
+
+from .board import bump_orders_version
+from .models import Order, Restaurant
+from .recommendations import get_orders_recommendations
+
+
+AUCTION_EPSILON_KM = 0.001
+
+logger = logging.getLogger(__name__)
+
+
+def get_orders_candidates(orders):
+    return {
+        order_id: [
+            (restaurant_id, distance)
+            for restaurant_id, distance in recommendation['restaurants']
+            if distance is not None
+        ]
+        for order_id, recommendation in get_orders_recommendations(orders).items()
+    }
+
+
+def get_restaurants_free_slots(restaurants, orders_count):
+    orders_in_work = dict(
+        Order.objects
+        .filter(status='In_procces', responsible_restaurant__in=restaurants)
+        .order_by()
+        .values('responsible_restaurant')
+        .annotate(orders_count=Count('id'))
+        .values_list('responsible_restaurant', 'orders_count')
+    )
+    free_slots = {}
+    for restaurant in restaurants:
+        if restaurant.capacity is None:
+            free_slots[restaurant.id] = orders_count
+        else:
+            free_slots[restaurant.id] = max(restaurant.capacity - orders_in_work.get(restaurant.id, 0), 0)
+    return free_slots
+
+
+def get_greedy_assignment(orders_candidates, free_slots):
+    free_slots = dict(free_slots)
+    assignment = {}
+    for order_id, candidates in orders_candidates.items():
+        for restaurant_id, _ in candidates:
+            if free_slots.get(restaurant_id):
+                assignment[order_id] = restaurant_id
+                free_slots[restaurant_id] -= 1
+                break
+    return assignment
+
+
+def get_auction_assignment(orders_candidates, free_slots, unassigned_penalty, epsilon=AUCTION_EPSILON_KM):
+    prices = dict.fromkeys(free_slots, 0.0)
+    restaurants_bids = {restaurant_id: [] for restaurant_id in free_slots}
+    assignment = {}
+    unassigned_orders = deque(orders_candidates)
+    while unassigned_orders:
+        order_id = unassigned_orders.popleft()
+        best_restaurant_id = None
+        best_value = second_value = -unassigned_penalty
+        for restaurant_id, distance in orders_candidates[order_id]:
+            if not free_slots.get(restaurant_id):
+                continue
+            value = -distance - prices[restaurant_id]
+            if value > best_value:
+                best_restaurant_id, best_value, second_value = restaurant_id, value, best_value
+            elif value > second_value:
+                second_value = value
+        if best_restaurant_id is None:
+            continue
+
+        bids = restaurants_bids[best_restaurant_id]
+        heapq.heappush(bids, (prices[best_restaurant_id] + best_value - second_value + epsilon, order_id))
+        assignment[order_id] = best_restaurant_id
+        if len(bids) > free_slots[best_restaurant_id]:
+            _, outbid_order_id = heapq.heappop(bids)
+            del assignment[outbid_order_id]
+            unassigned_orders.append(outbid_order_id)
+        if len(bids) == free_slots[best_restaurant_id]:
+            prices[best_restaurant_id] = bids[0][0]
+    return assignment
+
+
+def get_total_distance(orders_candidates, assignment):
+    total_distance = 0
+    for order_id, restaurant_id in assignment.items():
+        total_distance += dict(orders_candidates[order_id])[restaurant_id]
+    return total_distance
+
+
+def get_comparison_report(orders_candidates, greedy_assignment, auction_assignment):
+    common_orders_ids = greedy_assignment.keys() & auction_assignment.keys()
+    greedy_distance = get_total_distance(
+        orders_candidates, {order_id: greedy_assignment[order_id] for order_id in common_orders_ids}
+    )
+    auction_distance = get_total_distance(
+        orders_candidates, {order_id: auction_assignment[order_id] for order_id in common_orders_ids}
+    )
+    return {
+        'distance_saved': round(greedy_distance - auction_distance, 3),
+        'assigned_difference': len(auction_assignment) - len(greedy_assignment),
+    }
+
+
+def get_assignment_report(orders_candidates, free_slots, method):
+    started_at = time.perf_counter()
+    unassigned_penalty = 2 * settings.NEAREST_RESTAURANTS_RADIUS
+    if method == 'greedy':
+        assignment = get_greedy_assignment(orders_candidates, free_slots)
+    else:
+        assignment = get_auction_assignment(orders_candidates, free_slots, unassigned_penalty)
+    return {
+        'assignment': assignment,
+        'assigned': len(assignment),
+        'total_distance': round(get_total_distance(orders_candidates, assignment), 3),
+        'elapsed': round(time.perf_counter() - started_at, 3),
+    }
+
+
+def save_assignment(assignment):
+    restaurants_orders = {}
+    for order_id, restaurant_id in assignment.items():
+        restaurants_orders.setdefault(restaurant_id, []).append(order_id)
+
+    assigned_orders_count = 0
+    for restaurant_id, orders_ids in restaurants_orders.items():
+        assigned_orders_count += (
+            Order.objects
+            .filter(id__in=orders_ids, status='Unprocessed', responsible_restaurant__isnull=True)
+            .update(responsible_restaurant=restaurant_id, status='In_procces', updated_at=now())
+        )
+    transaction.on_commit(bump_orders_version)
+    transaction.on_commit(
+        lambda: ORDER_STATUS_TRANSITIONS.labels('Unprocessed', 'In_procces').inc(assigned_orders_count)
+    )
+    return assigned_orders_count
+
+
+def assign_orders(orders_ids=None, method='auction', dry_run=False, limit=None):
+    with transaction.atomic():
+        orders = (
+            Order.objects
+            .filter(status='Unprocessed', responsible_restaurant__isnull=True)
+            .order_by('registered_at', 'id')
+        )
+        if orders_ids is not None:
+            orders = orders.filter(id__in=orders_ids)
+        orders = list(orders[:limit])
+
+        orders_candidates = get_orders_candidates(orders)
+        orders_candidates = {order.id: orders_candidates[order.id] for order in orders}
+        restaurants_ids = {
+            restaurant_id
+            for candidates in orders_candidates.values()
+            for restaurant_id, _ in candidates
+        }
+        restaurants = list(
+            Restaurant.objects
+            .filter(id__in=restaurants_ids)
+            .select_for_update()
+            .order_by('id')
+        )
+        free_slots = get_restaurants_free_slots(restaurants, len(orders))
+
+        report = {'orders': len(orders)}
+        report[method] = get_assignment_report(orders_candidates, free_slots, method)
+        if dry_run:
+            other_method = 'greedy' if method == 'auction' else 'auction'
+            report[other_method] = get_assignment_report(orders_candidates, free_slots, other_method)
+            report.update(get_comparison_report(
+                orders_candidates,
+                report['greedy']['assignment'],
+                report['auction']['assignment'],
+            ))
+        else:
+            report['updated'] = save_assignment(report[method]['assignment'])
+    return report
+
+
+def auto_assign_orders():
+    try:
+        assign_orders()
+    except Exception:
+        logger.exception('Не удалось назначить рестораны заказам')
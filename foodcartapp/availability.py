@@ -0,0 +1,84 @@
+import logging
+import sys
+
+from .cache_versions import bump_cache_version, get_cache_version
+from .models import RestaurantMenuItem
+
+
+logger = logging.getLogger(__name__)
+
+AVAILABILITY_VERSION_CACHE_KEY = 'foodcartapp:availability_version'
+
+_availability_index = None
+
+
+class AvailabilityIndex:
+    def __init__(self, version, restaurants_and_products):
+        self.version = version
+        self.product_bits = {}
+        self.restaurant_products = {}
+        for restaurant_id, product_id in restaurants_and_products:
+            if product_id not in self.product_bits:
+                self.product_bits[product_id] = 1 << len(self.product_bits)
+            self.restaurant_products[restaurant_id] = (
+                self.restaurant_products.get(restaurant_id, 0) | self.product_bits[product_id]
+            )
+
+    def get_products_mask(self, product_ids):
+        products_mask = 0
+        for product_id in product_ids:
+            if product_id not in self.product_bits:
+                return None
+            products_mask |= self.product_bits[product_id]
+        return products_mask
+
+    def is_available(self, restaurant_id, product_id):
+        product_bit = self.product_bits.get(product_id, 0)
+        return bool(self.restaurant_products.get(restaurant_id, 0) & product_bit)
+
+    def get_able_to_cook_restaurant_ids(self, product_ids):
+        products_mask = self.get_products_mask(product_ids)
+        if not products_mask:
+            return []
+        return [
+            restaurant_id
+            for restaurant_id, restaurant_products in self.restaurant_products.items()
+            if restaurant_products & products_mask == products_mask
+        ]
+
+    def get_memory_footprint(self):
+        footprint = sys.getsizeof(self.product_bits) + sys.getsizeof(self.restaurant_products)
+        for product_id, product_bit in self.product_bits.items():
+            footprint += sys.getsizeof(product_id) + sys.getsizeof(product_bit)
+        for restaurant_id, restaurant_products in self.restaurant_products.items():
+            footprint += sys.getsizeof(restaurant_id) + sys.getsizeof(restaurant_products)
+        return footprint
+
+
+def get_availability_version():
+    return get_cache_version(AVAILABILITY_VERSION_CACHE_KEY)
+
+
+def invalidate_availability_index():
+    bump_cache_version(AVAILABILITY_VERSION_CACHE_KEY)
+
+
+def get_availability_index():
+    global _availability_index
+
+    version = get_cache_version(AVAILABILITY_VERSION_CACHE_KEY)
+    if _availability_index is None or _availability_index.version != version:
+        restaurants_and_products = (
+            RestaurantMenuItem.objects
+            .filter(availability=True)
+            .values_list('restaurant', 'product')
+        )
+        _availability_index = AvailabilityIndex(version, restaurants_and_products)
+        logger.info(
+            'Availability index v%s rebuilt: %s restaurants, %s products, %s bytes',
+            version,
+            len(_availability_index.restaurant_products),
+            len(_availability_index.product_bits),
+            _availability_index.get_memory_footprint(),
+        )
+    return _availability_index
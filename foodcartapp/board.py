@@ -0,0 +1,23 @@
+import time
+
+from .cache_versions import bump_cache_version, get_cache_version
+
+
+ORDERS_VERSION_CACHE_KEY = 'foodcartapp:orders_version'
+
+
+def get_orders_version():
+    return get_cache_version(ORDERS_VERSION_CACHE_KEY)
+
+
+def bump_orders_version():
+    bump_cache_version(ORDERS_VERSION_CACHE_KEY)
+
+
+def wait_for_orders_changes(seen_version, timeout, interval):
+    deadline = time.monotonic() + timeout
+    while True:
+        orders_version = get_orders_version()
+        if orders_version != seen_version or time.monotonic() >= deadline:
+            return orders_version
+        time.sleep(interval)
@@ -0,0 +1,30 @@
+import time
+
+from django.core.cache import caches
+
+
+def get_versions_cache():
+    return caches['versions']
+
+
+def get_initial_version():
+    return time.time_ns() // 1000
+
+
+def get_cache_version(key):
+    cache = get_versions_cache()
+    version = cache.get(key)
+    if version is None:
+        initial_version = get_initial_version()
+        cache.add(key, initial_version, timeout=None)
+        version = cache.get(key, initial_version)
+    return version
+
+
+def bump_cache_version(key):
+    cache = get_versions_cache()
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.add(key, get_initial_version(), timeout=None)
+        return get_cache_version(key)
@@ -0,0 +1,94 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.timezone import now
+
+from star_burger.compression import brotli, compress
+
+from .cache_versions import bump_cache_version, get_cache_version
+from .models import Product
+from .streaming import iter_json_array
+
+
+CATALOGUE_VERSION_CACHE_KEY = 'foodcartapp:catalogue_version'
+
+
+def serialize_product(product):
+    return {
+        'id': product.id,
+        'name': product.name,
+        'price': product.price,
+        'special_status': product.special_status,
+        'description': product.description,
+        'category': {
+            'id': product.category.id,
+            'name': product.category.name,
+        } if product.category else None,
+        'image': product.image.url,
+        'restaurant': {
+            'id': product.id,
+            'name': product.name,
+        }
+    }
+
+
+def iter_catalogue():
+    products = (
+        Product.objects
+        .select_related('category')
+        .available()
+        .order_by('id')
+        .iterator(chunk_size=settings.CATALOGUE_QUERY_CHUNK_SIZE)
+    )
+    return (serialize_product(product) for product in products)
+
+
+def iter_catalogue_chunks():
+    return iter_json_array(iter_catalogue())
+
+
+def get_catalogue_cache_key():
+    version = get_cache_version(CATALOGUE_VERSION_CACHE_KEY)
+    return f'foodcartapp:catalogue:{version}'
+
+
+def get_cached_catalogue():
+    return cache.get(get_catalogue_cache_key())
+
+
+def get_compressed_payloads(payload):
+    if len(payload) < settings.COMPRESSION_MIN_SIZE:
+        return {}
+    encodings = ['gzip', 'br'] if brotli is not None else ['gzip']
+    return {encoding: compress(payload, encoding) for encoding in encodings}
+
+
+def cache_catalogue(cache_key, payload):
+    catalogue = {
+        'payload': payload,
+        'compressed_payloads': get_compressed_payloads(payload),
+        'etag': f'"{hashlib.md5(payload).hexdigest()}"',
+        'last_modified': now().timestamp(),
+    }
+    cache.set(cache_key, catalogue, timeout=settings.CATALOGUE_CACHE_TIMEOUT)
+    return catalogue
+
+
+def iter_and_cache_catalogue():
+    cache_key = get_catalogue_cache_key()
+    chunks = []
+    payload_size = 0
+    for chunk in iter_catalogue_chunks():
+        if chunks is not None:
+            chunks.append(chunk)
+            payload_size += len(chunk)
+            if payload_size > settings.CATALOGUE_CACHE_MAX_SIZE:
+                chunks = None
+        yield chunk
+    if chunks is not None:
+        cache_catalogue(cache_key, b''.join(chunks))
+
+
+def invalidate_catalogue():
+    bump_cache_version(CATALOGUE_VERSION_CACHE_KEY)
@@ -0,0 +1,37 @@
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import IdempotencyKey
+
+
+def get_idempotency_ttl():
+    return timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL)
+
+
+def get_request_hash(data):
+    serialized_data = json.dumps(data, sort_keys=True, cls=DjangoJSONEncoder)
+    return hashlib.sha256(serialized_data.encode()).hexdigest()
+
+
+def get_stored_response(key):
+    return IdempotencyKey.objects.active(get_idempotency_ttl()).filter(key=key).first()
+
+
+def store_response(key, request_hash, response_data, status_code, order=None):
+    IdempotencyKey.objects.expired(get_idempotency_ttl()).filter(key=key).delete()
+    return IdempotencyKey.objects.create(
+        key=key,
+        request_hash=request_hash,
+        order=order,
+        response=response_data,
+        status_code=status_code,
+    )
+
+
+def delete_expired_keys():
+    deleted, _ = IdempotencyKey.objects.expired(get_idempotency_ttl()).delete()
+    return deleted
@@ -0,0 +1,44 @@
+from django.db import transaction
+from django.db.models import Count, Min
+from django.utils.timezone import now
+
+from places.views import enqueue_addresses
+
+from .models import Order, OrderIntake
+from .serializers import validate_orders
+
+
+def flush_order_intake(batch_size):
+    with transaction.atomic():
+        intakes = list(
+            OrderIntake.objects
+            .pending()
+            .select_for_update(skip_locked=True)
+            .order_by('id')[:batch_size]
+        )
+        if not intakes:
+            return 0
+
+        valid_orders, orders_errors = validate_orders([intake.payload for intake in intakes])
+        for index, order_details in valid_orders:
+            order_details['registered_at'] = intakes[index].accepted_at
+        orders = Order.objects.create_with_items([order_details for _, order_details in valid_orders])
+        transaction.on_commit(lambda: enqueue_addresses([order.address for order in orders]))
+
+        for (index, _), order in zip(valid_orders, orders):
+            intakes[index].order = order
+        for index, errors in orders_errors.items():
+            intakes[index].errors = errors
+        processed_at = now()
+        for intake in intakes:
+            intake.processed_at = processed_at
+        OrderIntake.objects.bulk_update(intakes, ['order', 'errors', 'processed_at'])
+    return len(intakes)
+
+
+def get_order_intake_stats():
+    stats = OrderIntake.objects.pending().aggregate(depth=Count('id'), oldest_accepted_at=Min('accepted_at'))
+    oldest_accepted_at = stats.pop('oldest_accepted_at')
+    stats['lag'] = (now() - oldest_accepted_at).total_seconds() if oldest_accepted_at else 0
+    stats['failed'] = OrderIntake.objects.filter(processed_at__isnull=False, order__isnull=True).count()
+    return stats
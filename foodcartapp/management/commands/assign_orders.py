@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from foodcartapp.assignment import assign_orders
+
+
+class Command(BaseCommand):
+    help = 'Назначает необработанным заказам ближайшие рестораны с учётом их вместимости'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--method', choices=['auction', 'greedy'], default='auction')
+        parser.add_argument('--limit', type=int, help='Сколько самых старых заказов назначить за раз')
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Ничего не сохранять, а сравнить суммарное расстояние с жадным назначением',
+        )
+
+    def handle(self, *args, **options):
+        report = assign_orders(method=options['method'], dry_run=options['dry_run'], limit=options['limit'])
+        self.stdout.write(f'Заказов без ресторана: {report["orders"]}')
+        for method in ('auction', 'greedy'):
+            if method in report:
+                self.stdout.write(
+                    f'{method}: назначено {report[method]["assigned"]}, '
+                    f'суммарное расстояние {report[method]["total_distance"]} км, {report[method]["elapsed"]} с'
+                )
+        if options['dry_run']:
+            self.stdout.write(
+                f'Сэкономлено по сравнению с жадным назначением на заказах, назначенных обоими способами: '
+                f'{report["distance_saved"]} км, назначено больше заказов: {report["assigned_difference"]}'
+            )
+        else:
+            self.stdout.write(f'Сохранено назначений: {report["updated"]}')
@@ -0,0 +1,264 @@
+import json
+import random
+import subprocess
+import time
+from decimal import Decimal
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import now
+
+from foodcartapp.availability import invalidate_availability_index
+from foodcartapp.catalogue import invalidate_catalogue
+from foodcartapp.models import (
+    Order,
+    Product,
+    ProductCategory,
+    Restaurant,
+    RestaurantMenuItem,
+)
+from foodcartapp.recommendations import invalidate_recommendations
+from places.addresses import normalize_address
+from places.models import Place
+
+SYNTHETIC_NAME = 'Синтетический'
+MANAGER_USERNAME = 'synthetic-manager'
+MOSCOW_LON, MOSCOW_LAT = 37.62, 55.75
+
+
+def get_synthetic_coordinates(rnd):
+    return MOSCOW_LON + rnd.uniform(-0.3, 0.3), MOSCOW_LAT + rnd.uniform(-0.2, 0.2)
+
+
+def create_resolved_places(addresses, rnd):
+    places = []
+    for address in addresses:
+        lon, lat = get_synthetic_coordinates(rnd)
+        places.append(
+            Place(
+                address=address,
+                normalized_address=normalize_address(address),
+                lon=lon,
+                lat=lat,
+                status='Resolved',
+            )
+        )
+    Place.objects.bulk_create(places, batch_size=1000, ignore_conflicts=True)
+
+
+def seed_synthetic_data(restaurants_count, products_count, orders_count, menu_density, seed):
+    rnd = random.Random(seed)
+    restaurants_addresses = [f'{SYNTHETIC_NAME} ресторан, {number}' for number in range(restaurants_count)]
+    Restaurant.objects.bulk_create([
+        Restaurant(name=f'{SYNTHETIC_NAME} ресторан {number}', address=address)
+        for number, address in enumerate(restaurants_addresses)
+    ])
+    category = ProductCategory.objects.create(name=f'{SYNTHETIC_NAME} категория')
+    Product.objects.bulk_create([
+        Product(
+            name=f'{SYNTHETIC_NAME} товар {number}',
+            category=category,
+            price=Decimal(rnd.randint(50, 500)),
+            image='synthetic.jpg',
+        )
+        for number in range(products_count)
+    ], batch_size=1000)
+    restaurants = list(Restaurant.objects.filter(name__startswith=SYNTHETIC_NAME))
+    products = list(Product.objects.filter(name__startswith=SYNTHETIC_NAME))
+    RestaurantMenuItem.objects.bulk_create([
+        RestaurantMenuItem(restaurant=restaurant, product=product, availability=rnd.random() < 0.9)
+        for restaurant in restaurants
+        for product in products
+        if rnd.random() < menu_density
+    ], batch_size=1000)
+
+    orders_addresses = [f'{SYNTHETIC_NAME} адрес, {number}' for number in range(min(orders_count, 1000))]
+    Order.objects.create_with_items([
+        {
+            'firstname': SYNTHETIC_NAME,
+            'lastname': f'Клиент {number}',
+            'phonenumber': '+79000000000',
+            'address': orders_addresses[number % len(orders_addresses)],
+            'products': [
+                {'product': product, 'quantity': rnd.randint(1, 3)}
+                for product in rnd.sample(products, rnd.randint(1, min(4, len(products))))
+            ],
+        }
+        for number in range(orders_count)
+    ])
+    create_resolved_places(restaurants_addresses + orders_addresses, rnd)
+    return products
+
+
+def delete_synthetic_data():
+    Order.objects.filter(firstname=SYNTHETIC_NAME).delete()
+    Restaurant.objects.filter(name__startswith=SYNTHETIC_NAME).delete()
+    Product.objects.filter(name__startswith=SYNTHETIC_NAME).delete()
+    ProductCategory.objects.filter(name__startswith=SYNTHETIC_NAME).delete()
+    Place.objects.filter(address__startswith=SYNTHETIC_NAME).delete()
+    get_user_model().objects.filter(username=MANAGER_USERNAME).delete()
+
+
+def get_percentile(sorted_values, percent):
+    index = min(len(sorted_values) - 1, round(percent / 100 * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+def measure(send_request, requests_count, warmup_count):
+    for _ in range(warmup_count):
+        send_request()
+
+    timings = []
+    queries_counts = []
+    for _ in range(requests_count):
+        with CaptureQueriesContext(connection) as queries:
+            started_at = time.perf_counter()
+            response = send_request()
+            if response.streaming:
+                b''.join(response.streaming_content)
+            elapsed = time.perf_counter() - started_at
+        assert response.status_code < 400, response.status_code
+        timings.append(elapsed * 1000)
+        queries_counts.append(len(queries))
+
+    timings.sort()
+    return {
+        'requests': requests_count,
+        'p50_ms': round(get_percentile(timings, 50), 2),
+        'p90_ms': round(get_percentile(timings, 90), 2),
+        'p99_ms': round(get_percentile(timings, 99), 2),
+        'max_ms': round(timings[-1], 2),
+        'mean_ms': round(sum(timings) / len(timings), 2),
+        'queries_min': min(queries_counts),
+        'queries_max': max(queries_counts),
+    }
+
+
+def get_git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def fetch_stub_coordinates(address):
+    return get_synthetic_coordinates(random.Random(address))
+
+
+class Command(BaseCommand):
+    help = 'Замеряет задержки и число запросов к БД у API и страниц менеджера на синтетических данных'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--restaurants', type=int, default=30)
+        parser.add_argument('--products', type=int, default=200)
+        parser.add_argument('--orders', type=int, default=2000)
+        parser.add_argument('--menu-density', type=float, default=0.7)
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--requests', type=int, default=50, help='Сколько раз запросить каждый адрес')
+        parser.add_argument('--warmup', type=int, default=3, help='Сколько запросов не учитывать')
+        parser.add_argument(
+            '--no-seed',
+            action='store_true',
+            help='Мерить на данных, которые уже есть в базе, без POST /api/order/',
+        )
+        parser.add_argument('--output', help='Куда сохранить результаты в JSON, по умолчанию вывести на экран')
+
+    def handle(self, *args, **options):
+        test_client_hosts = override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'])
+        with mock.patch('places.views.fetch_coordinates', fetch_stub_coordinates), test_client_hosts:
+            try:
+                if options['no_seed']:
+                    products = list(Product.objects.available()[:100])
+                else:
+                    products = seed_synthetic_data(
+                        options['restaurants'],
+                        options['products'],
+                        options['orders'],
+                        options['menu_density'],
+                        options['seed'],
+                    )
+                invalidate_availability_index()
+                invalidate_catalogue()
+                invalidate_recommendations()
+                results = self.run_benchmarks(
+                    products,
+                    options['requests'],
+                    options['warmup'],
+                    options['seed'],
+                    register_orders=not options['no_seed'],
+                )
+            finally:
+                delete_synthetic_data()
+                invalidate_availability_index()
+                invalidate_catalogue()
+                invalidate_recommendations()
+
+        report = {
+            'commit': get_git_commit(),
+            'created_at': now().isoformat(),
+            'database': connection.vendor,
+            'scale': {
+                'restaurants': Restaurant.objects.count(),
+                'products': Product.objects.count(),
+                'orders': Order.objects.count(),
+            } if options['no_seed'] else {
+                name: options[name] for name in ('restaurants', 'products', 'orders', 'menu_density', 'seed')
+            },
+            'settings': {
+                'ORDER_INTAKE_MODE': settings.ORDER_INTAKE_MODE,
+                'DISTANCE_METHOD': settings.DISTANCE_METHOD,
+                'MANAGER_ORDERS_PAGE_SIZE': settings.MANAGER_ORDERS_PAGE_SIZE,
+            },
+            'results': results,
+        }
+        serialized_report = json.dumps(report, ensure_ascii=False, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as output_file:
+                output_file.write(serialized_report)
+        else:
+            self.stdout.write(serialized_report)
+
+    def run_benchmarks(self, products, requests_count, warmup_count, seed, register_orders=True):
+        rnd = random.Random(seed)
+        client = Client()
+        manager = get_user_model().objects.create_user(MANAGER_USERNAME, is_staff=True)
+        manager_client = Client()
+        manager_client.force_login(manager)
+
+        def post_order():
+            order = {
+                'products': [
+                    {'product': product.id, 'quantity': rnd.randint(1, 3)}
+                    for product in rnd.sample(products, min(3, len(products)))
+                ],
+                'firstname': SYNTHETIC_NAME,
+                'lastname': 'Клиент',
+                'phonenumber': '+79000000000',
+                'address': f'{SYNTHETIC_NAME} адрес, {rnd.randrange(1000)}',
+            }
+            return client.post('/api/order/', json.dumps(order), content_type='application/json')
+
+        endpoints = {
+            'GET /api/products/': lambda: client.get('/api/products/'),
+            'POST /api/order/': post_order,
+            'GET /manager/orders/': lambda: manager_client.get('/manager/orders/'),
+            'GET /manager/products/': lambda: manager_client.get('/manager/products/'),
+        }
+        if not register_orders:
+            del endpoints['POST /api/order/']
+        results = {}
+        for name, send_request in endpoints.items():
+            results[name] = measure(send_request, requests_count, warmup_count)
+            self.stderr.write(f'{name}: p50 {results[name]["p50_ms"]} мс, запросов к БД {results[name]["queries_max"]}')
+        return results
@@ -0,0 +1,65 @@
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import Client, override_settings
+
+from foodcartapp.catalogue import invalidate_catalogue
+from star_burger.compression import brotli, compress
+from star_burger.storage import COMPRESSED_EXTENSIONS, STATIC_BROTLI_QUALITY
+
+from .benchmark_streaming import create_synthetic_products
+
+
+def get_encodings():
+    return ['gzip', 'br'] if brotli is not None else ['gzip']
+
+
+def format_size(size, original_size):
+    return f'{size / 1024:.0f} КБ ({100 - size * 100 / original_size:.0f}% экономии)'
+
+
+class Command(BaseCommand):
+    help = 'Показывает, сколько байт экономит сжатие ответа каталога и JS/CSS-бандлов'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--products', type=int, default=10000, help='Сколько синтетических товаров добавить')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            create_synthetic_products(options['products'])
+            invalidate_catalogue()
+            with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+                self.report_catalogue()
+            transaction.set_rollback(True)
+        invalidate_catalogue()
+        self.report_bundles()
+
+    def report_catalogue(self):
+        client = Client()
+        b''.join(client.get('/api/products/').streaming_content)
+        started_at = time.perf_counter()
+        original_size = len(client.get('/api/products/').content)
+        elapsed = time.perf_counter() - started_at
+        self.stdout.write(f'/api/products/: {original_size / 1024:.0f} КБ без сжатия, ответ за {elapsed * 1000:.0f} мс')
+        for encoding in get_encodings():
+            started_at = time.perf_counter()
+            response = client.get('/api/products/', HTTP_ACCEPT_ENCODING=encoding)
+            elapsed = time.perf_counter() - started_at
+            self.stdout.write(
+                f'  {encoding}: {format_size(len(response.content), original_size)}, ответ за {elapsed * 1000:.0f} мс'
+            )
+
+    def report_bundles(self):
+        bundles_dir = os.path.join(settings.BASE_DIR, 'bundles')
+        for name in sorted(os.listdir(bundles_dir)):
+            if os.path.splitext(name)[1] not in COMPRESSED_EXTENSIONS:
+                continue
+            with open(os.path.join(bundles_dir, name), 'rb') as bundle_file:
+                content = bundle_file.read()
+            self.stdout.write(f'bundles/{name}: {len(content) / 1024:.0f} КБ без сжатия')
+            for encoding in get_encodings():
+                compressed_content = compress(content, encoding, brotli_quality=STATIC_BROTLI_QUALITY)
+                self.stdout.write(f'  {encoding}: {format_size(len(compressed_content), len(content))}')
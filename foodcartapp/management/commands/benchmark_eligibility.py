@@ -0,0 +1,114 @@
+import random
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from foodcartapp.models import (
+    Order,
+    OrderItem,
+    Product,
+    Restaurant,
+    RestaurantMenuItem,
+)
+
+
+def get_able_to_cook_restaurants_by_prefetch(orders):
+    orders_ids = orders.filter(items__product__menu_items__availability=True).values_list('id', flat=True)
+    orders = orders.select_related('responsible_restaurant')\
+        .prefetch_related('items__product__menu_items__restaurant')\
+        .filter(id__in=orders_ids, status__in=['Unprocessed', 'In_procces'])\
+        .order_by('responsible_restaurant_id')
+    able_to_cook_restaurant_ids = {}
+    for order in orders:
+        available_restaurants = []
+        for order_item in order.items.all():
+            available_restaurants.append({
+                restaurant_item.restaurant.id
+                for restaurant_item in order_item.product.menu_items.all()
+                if restaurant_item.availability
+            })
+        able_to_cook_restaurant_ids[order.id] = set.intersection(*available_restaurants)
+    return able_to_cook_restaurant_ids
+
+
+def get_able_to_cook_restaurants_by_availability_index(orders):
+    able_to_cook_restaurant_ids = orders.open().with_available_menu_items().get_able_to_cook_restaurant_ids()
+    return {
+        order_id: set(restaurant_ids)
+        for order_id, restaurant_ids in able_to_cook_restaurant_ids.items()
+    }
+
+
+def create_synthetic_orders(restaurants_count, products_count, orders_count, menu_density, seed):
+    rnd = random.Random(seed)
+    Restaurant.objects.bulk_create([
+        Restaurant(name=f'Ресторан {number}', address=f'Москва, ул. Синтетическая, {number}')
+        for number in range(restaurants_count)
+    ])
+    Product.objects.bulk_create([
+        Product(
+            name=f'Товар {number}',
+            price=Decimal(rnd.randint(50, 500)),
+            image='synthetic.jpg',
+        )
+        for number in range(products_count)
+    ])
+    restaurants = list(Restaurant.objects.order_by('-id')[:restaurants_count])
+    products = list(Product.objects.order_by('-id')[:products_count])
+    RestaurantMenuItem.objects.bulk_create([
+        RestaurantMenuItem(restaurant=restaurant, product=product, availability=rnd.random() < 0.9)
+        for restaurant in restaurants
+        for product in products
+        if rnd.random() < menu_density
+    ])
+    for number in range(orders_count):
+        order = Order.objects.create(
+            firstname='Иван',
+            lastname=f'Синтетический {number}',
+            phonenumber='+79000000000',
+            address=f'Москва, ул. Заказная, {number}',
+        )
+        OrderItem.objects.bulk_create([
+            OrderItem(order=order, product=product, quantity=rnd.randint(1, 3), price=product.price)
+            for product in rnd.sample(products, rnd.randint(1, 4))
+        ])
+    return Order.objects.filter(lastname__startswith='Синтетический')
+
+
+class Command(BaseCommand):
+    help = 'Сравнивает старый и новый способ поиска ресторанов, способных приготовить заказ'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--restaurants', type=int, default=30)
+        parser.add_argument('--products', type=int, default=100)
+        parser.add_argument('--orders', type=int, default=2000)
+        parser.add_argument('--menu-density', type=float, default=0.7)
+        parser.add_argument('--seed', type=int, default=1)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            orders = create_synthetic_orders(
+                options['restaurants'],
+                options['products'],
+                options['orders'],
+                options['menu_density'],
+                options['seed'],
+            )
+            connection.queries_log.clear()
+            results = {}
+            for title, get_restaurants in (
+                ('prefetch', get_able_to_cook_restaurants_by_prefetch),
+                ('availability index', get_able_to_cook_restaurants_by_availability_index),
+            ):
+                with CaptureQueriesContext(connection) as queries:
+                    started_at = time.perf_counter()
+                    results[title] = get_restaurants(orders.all())
+                    elapsed = time.perf_counter() - started_at
+                self.stdout.write(f'{title}: {elapsed:.3f} с, запросов к БД: {len(queries)}')
+
+            if results['prefetch'] != results['availability index']:
+                self.stderr.write('Результаты расходятся')
+            transaction.set_rollback(True)
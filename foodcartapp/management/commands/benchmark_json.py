@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from foodcartapp.catalogue import serialize_product
+from foodcartapp.models import Product
+from foodcartapp.renderers import dumps_with_orjson, dumps_with_stdlib, orjson
+
+from .benchmark_streaming import create_synthetic_products
+
+
+class Command(BaseCommand):
+    help = 'Сравнивает скорость сериализации каталога в JSON через stdlib json и orjson'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--products', type=int, default=10000, help='Сколько синтетических товаров добавить')
+        parser.add_argument('--repeat', type=int, default=10)
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            raise CommandError('orjson не установлен')
+
+        with transaction.atomic():
+            create_synthetic_products(options['products'])
+            catalogue = [
+                serialize_product(product)
+                for product in Product.objects.select_related('category').available().order_by('id')
+            ]
+            transaction.set_rollback(True)
+
+        self.stdout.write(f'Товаров в каталоге: {len(catalogue)}')
+        for pretty in (False, True):
+            timings = {}
+            for engine, dumps in (('stdlib', dumps_with_stdlib), ('orjson', dumps_with_orjson)):
+                payload = dumps(catalogue, pretty)
+                started_at = time.perf_counter()
+                for _ in range(options['repeat']):
+                    dumps(catalogue, pretty)
+                timings[engine] = (time.perf_counter() - started_at) / options['repeat']
+                self.stdout.write(
+                    f'{engine}{" ?pretty=1" if pretty else ""}: {timings[engine] * 1000:.1f} мс, '
+                    f'{len(payload) / 1024:.0f} КБ'
+                )
+            self.stdout.write(f'orjson быстрее в {timings["stdlib"] / timings["orjson"]:.1f} раза')
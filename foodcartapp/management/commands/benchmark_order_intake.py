@@ -0,0 +1,76 @@
+import json
+import time
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+
+from foodcartapp.intake import flush_order_intake
+from foodcartapp.models import Order, OrderIntake, Product
+from places.models import Place
+
+SYNTHETIC_NAME = 'Синтетический'
+
+
+def get_synthetic_orders(products_ids, orders_count):
+    return [
+        {
+            'products': [
+                {'product': products_ids[(number + shift) % len(products_ids)], 'quantity': 1 + shift}
+                for shift in range(3)
+            ],
+            'firstname': SYNTHETIC_NAME,
+            'lastname': f'Клиент {number}',
+            'phonenumber': '+79161234567',
+            'address': f'{SYNTHETIC_NAME} адрес {number % 100}',
+        }
+        for number in range(orders_count)
+    ]
+
+
+def delete_synthetic_data(orders):
+    OrderIntake.objects.filter(payload__firstname=SYNTHETIC_NAME).delete()
+    Order.objects.filter(firstname=SYNTHETIC_NAME).delete()
+    Product.objects.filter(name__startswith=SYNTHETIC_NAME).delete()
+    Place.objects.filter(address__in={order['address'] for order in orders}).delete()
+
+
+class Command(BaseCommand):
+    help = 'Сравнивает, сколько заказов в секунду принимает /api/order/ сразу и через буфер'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--orders', type=int, default=1000)
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        Product.objects.bulk_create(
+            [
+                Product(name=f'{SYNTHETIC_NAME} товар {number}', price=Decimal(100 + number), image='synthetic.jpg')
+                for number in range(10)
+            ]
+        )
+        products_ids = list(Product.objects.filter(name__startswith=SYNTHETIC_NAME).values_list('id', flat=True))
+        orders = get_synthetic_orders(products_ids, options['orders'])
+        client = Client()
+        try:
+            for mode in ('sync', 'buffered'):
+                test_client_settings = override_settings(
+                    ORDER_INTAKE_MODE=mode,
+                    ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+                )
+                with test_client_settings:
+                    started_at = time.perf_counter()
+                    for order in orders:
+                        response = client.post('/api/order/', json.dumps(order), content_type='application/json')
+                        assert response.status_code in (200, 202), response.content
+                    elapsed = time.perf_counter() - started_at
+                self.stdout.write(f'{mode}: {len(orders) / elapsed:.0f} заказов/с, {elapsed:.2f} с')
+
+            started_at = time.perf_counter()
+            while flush_order_intake(options['batch_size']):
+                pass
+            elapsed = time.perf_counter() - started_at
+            self.stdout.write(f'перенос буфера в заказы: {len(orders) / elapsed:.0f} заказов/с, {elapsed:.2f} с')
+        finally:
+            delete_synthetic_data(orders)
@@ -0,0 +1,68 @@
+import json
+import time
+import tracemalloc
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from foodcartapp.catalogue import iter_catalogue_chunks, serialize_product
+from foodcartapp.models import Product, Restaurant, RestaurantMenuItem
+
+
+def dump_catalogue_at_once():
+    products = Product.objects.select_related('category').available()
+    dumped_products = [serialize_product(product) for product in products]
+    return len(json.dumps(dumped_products, cls=DjangoJSONEncoder, ensure_ascii=False, indent=4).encode())
+
+
+def dump_catalogue_by_chunks():
+    return sum(len(chunk) for chunk in iter_catalogue_chunks())
+
+
+def create_synthetic_products(products_count):
+    restaurant = Restaurant.objects.create(name='Синтетический ресторан')
+    Product.objects.bulk_create(
+        [
+            Product(
+                name=f'Товар {number}',
+                price=Decimal(100 + number % 400),
+                image='synthetic.jpg',
+                description='Синтетический товар для замера потребления памяти',
+            )
+            for number in range(products_count)
+        ],
+        batch_size=5000,
+    )
+    products_ids = Product.objects.filter(name__startswith='Товар ').values_list('id', flat=True)
+    RestaurantMenuItem.objects.bulk_create(
+        [RestaurantMenuItem(restaurant=restaurant, product_id=product_id) for product_id in products_ids],
+        batch_size=5000,
+    )
+
+
+class Command(BaseCommand):
+    help = 'Сравнивает пиковое потребление памяти при выдаче каталога целиком и потоком'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--products', type=int, default=100000)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            create_synthetic_products(options['products'])
+            for title, dump_catalogue in (
+                ('целиком', dump_catalogue_at_once),
+                ('потоком', dump_catalogue_by_chunks),
+            ):
+                tracemalloc.start()
+                started_at = time.perf_counter()
+                payload_size = dump_catalogue()
+                elapsed = time.perf_counter() - started_at
+                _, peak_memory = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                self.stdout.write(
+                    f'{title}: {payload_size / 1024 / 1024:.1f} МБ ответа, '
+                    f'пик памяти {peak_memory / 1024 / 1024:.1f} МБ, {elapsed:.2f} с'
+                )
+            transaction.set_rollback(True)
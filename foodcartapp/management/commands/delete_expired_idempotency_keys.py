@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+
+from foodcartapp.idempotency import delete_expired_keys
+
+
+class Command(BaseCommand):
+    help = 'Удаляет просроченные ключи идемпотентности заказов'
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'Удалено ключей: {delete_expired_keys()}')
@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from foodcartapp.intake import flush_order_intake, get_order_intake_stats
+
+
+class Command(BaseCommand):
+    help = 'Переносит принятые в буфер заказы в таблицы заказов'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--loop', action='store_true', help='Не завершаться, а ждать новые заказы')
+        parser.add_argument('--sleep', type=float, default=1, help='Пауза в секундах, когда буфер пуст')
+        parser.add_argument('--stats', action='store_true', help='Показать размер буфера и выйти')
+
+    def handle(self, *args, **options):
+        if options['stats']:
+            self.write_stats()
+            return
+
+        while True:
+            flushed_orders_count = flush_order_intake(options['batch_size'])
+            if flushed_orders_count:
+                self.stdout.write(f'Обработано заказов: {flushed_orders_count}')
+            elif not options['loop']:
+                self.write_stats()
+                return
+            else:
+                time.sleep(options['sleep'])
+
+    def write_stats(self):
+        stats = get_order_intake_stats()
+        self.stdout.write(
+            f'В буфере: {stats["depth"]}, ждёт дольше всех: {stats["lag"]:.0f} с, '
+            f'не удалось создать: {stats["failed"]}'
+        )
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from django.db.models import F, Max
+
+from foodcartapp.models import Order
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает сохранённую стоимость заказов по их позициям'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verify', action='store_true', help='Только найти заказы с неверной стоимостью')
+        parser.add_argument('--batch-size', type=int, default=10000)
+
+    def handle(self, *args, **options):
+        last_order_id = Order.objects.aggregate(last_id=Max('id'))['last_id'] or 0
+        batch_size = options['batch_size']
+        orders_count = 0
+        for first_order_id in range(1, last_order_id + 1, batch_size):
+            orders = Order.objects.filter(id__gte=first_order_id, id__lt=first_order_id + batch_size)
+            if options['verify']:
+                wrong_orders = (
+                    orders
+                    .with_amount()
+                    .exclude(total=F('amount'))
+                    .exclude(total=0, amount__isnull=True)
+                    .values_list('id', 'total', 'amount')
+                )
+                for order_id, total, amount in wrong_orders:
+                    orders_count += 1
+                    self.stdout.write(f'Заказ {order_id}: сохранено {total}, по позициям {amount or 0}')
+            else:
+                orders_count += orders.update_totals()
+
+        if options['verify']:
+            self.stdout.write(f'Заказов с неверной стоимостью: {orders_count}')
+        else:
+            self.stdout.write(f'Исправлена стоимость заказов: {orders_count}')
@@ -0,0 +1,213 @@
+import random
+import time
+from datetime import timedelta
+from decimal import Decimal
+from itertools import accumulate
+
+from django.core.management.base import BaseCommand
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils.timezone import now
+from phonenumber_field.phonenumber import PhoneNumber
+
+from foodcartapp.availability import invalidate_availability_index
+from foodcartapp.catalogue import invalidate_catalogue
+from foodcartapp.models import (
+    Order,
+    OrderItem,
+    Product,
+    ProductCategory,
+    Restaurant,
+    RestaurantMenuItem,
+)
+from foodcartapp.recommendations import invalidate_recommendations
+from places.addresses import normalize_address
+from places.models import Place
+
+MOSCOW_LON, MOSCOW_LAT = 37.62, 55.75
+STREETS = [
+    'Тверская', 'Арбат', 'Ленинский проспект', 'Профсоюзная', 'Мясницкая', 'Пятницкая',
+    'Покровка', 'Сретенка', 'Маросейка', 'Новый Арбат', 'Садовая-Кудринская', 'Бауманская',
+]
+FIRSTNAMES = ['Иван', 'Анна', 'Пётр', 'Мария', 'Алексей', 'Ольга', 'Дмитрий', 'Елена', 'Сергей', 'Наталья']
+LASTNAMES = ['Иванов', 'Смирнов', 'Кузнецов', 'Попов', 'Васильев', 'Петров', 'Соколов', 'Михайлов']
+ITEMS_COUNT_WEIGHTS = [35, 30, 20, 10, 5]
+QUANTITY_WEIGHTS = [80, 15, 5]
+
+
+def get_addresses(addresses_count):
+    return [
+        f'Москва, {STREETS[number % len(STREETS)]}, {number // len(STREETS) + 1}'
+        for number in range(addresses_count)
+    ]
+
+
+def create_places(rnd, addresses, batch_size):
+    places = []
+    for address in dict.fromkeys(addresses):
+        places.append(
+            Place(
+                address=address,
+                normalized_address=normalize_address(address),
+                lon=MOSCOW_LON + rnd.uniform(-0.3, 0.3),
+                lat=MOSCOW_LAT + rnd.uniform(-0.2, 0.2),
+                status='Resolved',
+            )
+        )
+    Place.objects.bulk_create(places, batch_size=batch_size, ignore_conflicts=True)
+
+
+def create_catalogue(rnd, restaurants_count, categories_count, products_count, menu_density, batch_size):
+    restaurants_addresses = [f'Москва, {rnd.choice(STREETS)}, {number + 1}к{rnd.randint(1, 5)}' for number in range(restaurants_count)]
+    Restaurant.objects.bulk_create(
+        [
+            Restaurant(name=f'Ресторан {number + 1}', address=address, contact_phone='+74950000000')
+            for number, address in enumerate(restaurants_addresses)
+        ],
+        batch_size=batch_size,
+    )
+    ProductCategory.objects.bulk_create(
+        [ProductCategory(name=f'Категория {number + 1}') for number in range(categories_count)],
+        batch_size=batch_size,
+    )
+    categories = list(ProductCategory.objects.order_by('-id')[:categories_count])
+    Product.objects.bulk_create(
+        [
+            Product(
+                name=f'Товар {number + 1}',
+                category=rnd.choice(categories),
+                price=Decimal(rnd.randrange(50, 900, 10)),
+                image='synthetic.jpg',
+                description='Товар для нагрузочного тестирования',
+            )
+            for number in range(products_count)
+        ],
+        batch_size=batch_size,
+    )
+    restaurants = list(Restaurant.objects.order_by('-id')[:restaurants_count])
+    products = list(Product.objects.order_by('-id')[:products_count])
+    RestaurantMenuItem.objects.bulk_create(
+        [
+            RestaurantMenuItem(restaurant=restaurant, product=product, availability=rnd.random() < 0.9)
+            for restaurant in restaurants
+            for product in products
+            if rnd.random() < menu_density
+        ],
+        batch_size=batch_size,
+    )
+    return restaurants, products, restaurants_addresses
+
+
+def create_orders_batch(rnd, first_order_id, orders_count, context):
+    orders = []
+    order_items = []
+    for order_id in range(first_order_id, first_order_id + orders_count):
+        registered_at = context['started_at'] - timedelta(seconds=rnd.uniform(0, context['period']))
+        items_count = rnd.choices(range(1, len(ITEMS_COUNT_WEIGHTS) + 1), weights=ITEMS_COUNT_WEIGHTS)[0]
+        products = rnd.choices(context['products'], cum_weights=context['cum_weights'], k=items_count)
+        total = 0
+        for product in products:
+            quantity = rnd.choices(range(1, len(QUANTITY_WEIGHTS) + 1), weights=QUANTITY_WEIGHTS)[0]
+            total += product.price * quantity
+            order_items.append(OrderItem(order_id=order_id, product=product, quantity=quantity, price=product.price))
+
+        is_open = registered_at > context['open_since']
+        orders.append(
+            Order(
+                id=order_id,
+                firstname=rnd.choice(FIRSTNAMES),
+                lastname=rnd.choice(LASTNAMES),
+                phonenumber=rnd.choice(context['phonenumbers']),
+                address=rnd.choice(context['addresses']),
+                status=rnd.choice(['Unprocessed', 'In_procces']) if is_open else 'Сompleted',
+                payment_option=rnd.choice(['Online', 'Cash']),
+                registered_at=registered_at,
+                called_at=None if is_open else registered_at + timedelta(minutes=rnd.randint(1, 10)),
+                delivered_at=None if is_open else registered_at + timedelta(minutes=rnd.randint(30, 90)),
+                responsible_restaurant=None if is_open else rnd.choice(context['restaurants']),
+                total=total,
+            )
+        )
+    Order.objects.bulk_create(orders)
+    OrderItem.objects.bulk_create(order_items)
+    return len(order_items)
+
+
+def reset_sequences():
+    models = [Restaurant, ProductCategory, Product, RestaurantMenuItem, Order, OrderItem, Place]
+    with connection.cursor() as cursor:
+        for sql in connection.ops.sequence_reset_sql(no_style(), models):
+            cursor.execute(sql)
+
+
+class Command(BaseCommand):
+    help = 'Заполняет базу синтетическими ресторанами, товарами и заказами для нагрузочного тестирования'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--restaurants', type=int, default=100)
+        parser.add_argument('--categories', type=int, default=10)
+        parser.add_argument('--products', type=int, default=500)
+        parser.add_argument('--menu-density', type=float, default=0.6, help='Доля товаров в меню каждого ресторана')
+        parser.add_argument('--orders', type=int, default=100000)
+        parser.add_argument('--addresses', type=int, default=20000, help='Сколько разных адресов у заказов')
+        parser.add_argument('--open-orders', type=float, default=0.01, help='Доля необработанных и взятых в работу заказов')
+        parser.add_argument('--days', type=int, default=365, help='За сколько дней распределить заказы')
+        parser.add_argument('--batch-size', type=int, default=10000)
+        parser.add_argument('--seed', type=int, default=1)
+
+    def handle(self, *args, **options):
+        rnd = random.Random(options['seed'])
+        batch_size = options['batch_size']
+        started_at = time.perf_counter()
+
+        with transaction.atomic():
+            restaurants, products, restaurants_addresses = create_catalogue(
+                rnd,
+                options['restaurants'],
+                options['categories'],
+                options['products'],
+                options['menu_density'],
+                batch_size,
+            )
+            addresses = get_addresses(options['addresses'])
+            create_places(rnd, restaurants_addresses + addresses, batch_size)
+        self.stdout.write(
+            f'Ресторанов: {len(restaurants)}, товаров: {len(products)}, '
+            f'адресов: {len(addresses)}, {time.perf_counter() - started_at:.1f} с'
+        )
+
+        period = timedelta(days=options['days']).total_seconds()
+        context = {
+            'started_at': now(),
+            'period': period,
+            'open_since': now() - timedelta(seconds=period * options['open_orders']),
+            'restaurants': restaurants,
+            'products': products,
+            'cum_weights': list(accumulate(1 / rank for rank in range(1, len(products) + 1))),
+            'addresses': addresses,
+            'phonenumbers': [PhoneNumber.from_string(f'+7916{number:07d}') for number in range(1000)],
+        }
+        first_order_id = (Order.objects.aggregate(last_id=Max('id'))['last_id'] or 0) + 1
+        orders_count = options['orders']
+        created_orders_count = 0
+        created_items_count = 0
+        while created_orders_count < orders_count:
+            orders_batch_size = min(batch_size, orders_count - created_orders_count)
+            with transaction.atomic():
+                created_items_count += create_orders_batch(
+                    rnd,
+                    first_order_id + created_orders_count,
+                    orders_batch_size,
+                    context,
+                )
+            created_orders_count += orders_batch_size
+            self.stdout.write(
+                f'Заказов: {created_orders_count}/{orders_count}, позиций: {created_items_count}, '
+                f'{time.perf_counter() - started_at:.1f} с'
+            )
+
+        reset_sequences()
+        invalidate_availability_index()
+        invalidate_catalogue()
+        invalidate_recommendations()
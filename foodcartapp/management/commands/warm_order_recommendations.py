@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from foodcartapp.models import Order
+from foodcartapp.recommendations import (
+    get_orders_recommendations,
+    invalidate_recommendations,
+    is_cacheable,
+)
+
+
+class Command(BaseCommand):
+    help = 'Заранее считает и кладёт в кэш подходящие рестораны для открытых заказов'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--reset', action='store_true', help='Сначала сбросить весь кэш')
+
+    def handle(self, *args, **options):
+        if options['reset']:
+            invalidate_recommendations()
+
+        started_at = time.perf_counter()
+        orders = Order.objects.open().with_available_menu_items().order_by('id')
+        orders_count = 0
+        cached_orders_count = 0
+        last_order_id = 0
+        while True:
+            orders_batch = list(orders.filter(id__gt=last_order_id)[:options['batch_size']])
+            if not orders_batch:
+                break
+
+            recommendations = get_orders_recommendations(orders_batch)
+            orders_count += len(orders_batch)
+            cached_orders_count += sum(
+                is_cacheable(recommendation) for recommendation in recommendations.values()
+            )
+            last_order_id = orders_batch[-1].id
+
+        self.stdout.write(
+            f'Заказов: {orders_count}, в кэше: {cached_orders_count}, '
+            f'без координат: {orders_count - cached_orders_count}, {time.perf_counter() - started_at:.1f} с'
+        )
@@ -0,0 +1,31 @@
+# Generated by Django 3.2.15 on 2026-10-18 18:56
+
+import django.core.serializers.json
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('foodcartapp', '0057_idempotencykey'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderIntake',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('payload', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder, verbose_name='Данные заказа')),
+                ('accepted_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now, verbose_name='Время приёма')),
+                ('processed_at', models.DateTimeField(blank=True, db_index=True, null=True, verbose_name='Время обработки')),
+                ('errors', models.JSONField(blank=True, null=True, verbose_name='Ошибки')),
+                ('order', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='intake', to='foodcartapp.order', verbose_name='заказ')),
+            ],
+            options={
+                'verbose_name': 'Принятый заказ',
+                'verbose_name_plural': 'Принятые заказы',
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.15 on 2026-10-18 19:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('foodcartapp', '0059_order_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='restaurant',
+            name='capacity',
+            field=models.PositiveIntegerField(blank=True, help_text='Сколько заказов ресторан готовит одновременно. Пусто — без ограничений', null=True, verbose_name='вместимость'),
+        ),
+    ]
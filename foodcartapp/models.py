@@ -1,9 +1,32 @@
+from contextlib import contextmanager
+from decimal import Decimal
+
+from django.core.serializers.json import DjangoJSONEncoder
 from django.core.validators import MinValueValidator
-from django.db import models
-from django.db.models import F, Sum
+from django.db import connections, models, transaction
+from django.db.models import Exists, F, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
 from django.utils.timezone import now
 from phonenumber_field.modelfields import PhoneNumberField
 
+from .board import bump_orders_version
+
+_deleting_orders_ids = set()
+
+
+@contextmanager
+def deleting_orders(orders_ids):
+    orders_ids = set(orders_ids) - _deleting_orders_ids
+    _deleting_orders_ids.update(orders_ids)
+    try:
+        yield
+    finally:
+        _deleting_orders_ids.difference_update(orders_ids)
+
+
+def is_order_being_deleted(order_id):
+    return order_id in _deleting_orders_ids
+
 
 class Restaurant(models.Model):
     name = models.CharField(
@@ -20,6 +43,12 @@ class Restaurant(models.Model):
         max_length=50,
         blank=True,
     )
+    capacity = models.PositiveIntegerField(
+        'вместимость',
+        null=True,
+        blank=True,
+        help_text='Сколько заказов ресторан готовит одновременно. Пусто — без ограничений',
+    )
 
     class Meta:
         verbose_name = 'ресторан'
@@ -127,31 +156,113 @@ class RestaurantMenuItem(models.Model):
 
 
 class OrderQuerySet(models.QuerySet):
+    def delete(self):
+        with deleting_orders(self.values_list('id', flat=True)):
+            return super().delete()
+
     def with_amount(self):
         amount = self.annotate(
             amount=Sum(F('items__price') * F('items__quantity')))
 
         return amount
 
-    def with_are_able_to_cook_restaurants(self):
-        orders_ids = self.filter(items__product__menu_items__availability=True).values_list('id', flat=True)
-        orders = self.select_related('responsible_restaurant')\
-            .prefetch_related('items__product__menu_items__restaurant')\
-            .filter(id__in=orders_ids, status__in=['Unprocessed', 'In_procces'])\
-            .order_by('responsible_restaurant_id')
-        for order in orders:
-            available_restaurants = []
-            filtered_order_items = order.items.all()
-            for order_item in filtered_order_items:
-                restaurants = []
-                filtered_restaurant_items = order_item.product.menu_items.all()
-                for restaurant_item in filtered_restaurant_items:
-                    restaurants.append(restaurant_item.restaurant)
-                available_restaurants.append(restaurants)
-            are_able_to_cook_restaurants = list(set.intersection(*map(set, available_restaurants)))
-            order.are_able_to_cook_restaurants = are_able_to_cook_restaurants
+    def create_with_items(self, orders_details):
+        orders = [
+            self.model(
+                firstname=order_details['firstname'],
+                lastname=order_details['lastname'],
+                phonenumber=order_details['phonenumber'],
+                address=order_details['address'],
+                registered_at=order_details.get('registered_at') or now(),
+                total=sum(
+                    Decimal(product['product'].price) * product['quantity']
+                    for product in order_details['products']
+                ),
+            )
+            for order_details in orders_details
+        ]
+        if connections[self.db].features.can_return_rows_from_bulk_insert:
+            self.bulk_create(orders, batch_size=1000)
+        else:
+            for order in orders:
+                order.save(using=self.db)
+
+        order_items = []
+        for order, order_details in zip(orders, orders_details):
+            for product in order_details['products']:
+                order_items.append(
+                    OrderItem(
+                        order=order,
+                        product=product['product'],
+                        quantity=product['quantity'],
+                        price=Decimal(product['product'].price)
+                    )
+                )
+        OrderItem.objects.using(self.db).bulk_create(order_items, batch_size=1000)
+        transaction.on_commit(bump_orders_version, using=self.db)
         return orders
 
+    def update_totals(self):
+        items_total = (
+            OrderItem.objects
+            .filter(order=OuterRef('pk'))
+            .values('order')
+            .annotate(total=Sum(F('price') * F('quantity')))
+            .values('total')
+        )
+        items_total = Coalesce(
+            Subquery(items_total, output_field=models.DecimalField()),
+            Value(Decimal(0)),
+        )
+        changed_orders_ids = list(
+            self
+            .annotate(items_total=items_total)
+            .exclude(total=F('items_total'))
+            .values_list('id', flat=True)
+        )
+        if not changed_orders_ids:
+            return 0
+        transaction.on_commit(bump_orders_version, using=self.db)
+        return (
+            self.model.objects
+            .using(self.db)
+            .filter(id__in=changed_orders_ids)
+            .update(total=items_total, updated_at=now())
+        )
+
+    def changed_after(self, updated_at, order_id):
+        return self.filter(
+            Q(updated_at__gt=updated_at) | Q(updated_at=updated_at, id__gt=order_id)
+        ).order_by('updated_at', 'id')
+
+    def get_able_to_cook_restaurant_ids(self):
+        from .availability import get_availability_index
+
+        orders_products = {}
+        orders_items = (
+            OrderItem.objects
+            .filter(order__in=self.order_by().values('pk'))
+            .values_list('order', 'product')
+        )
+        for order_id, product_id in orders_items:
+            orders_products.setdefault(order_id, set()).add(product_id)
+
+        availability_index = get_availability_index()
+        return {
+            order_id: availability_index.get_able_to_cook_restaurant_ids(product_ids)
+            for order_id, product_ids in orders_products.items()
+        }
+
+    def open(self):
+        return self.filter(status__in=['Unprocessed', 'In_procces'])
+
+    def with_available_menu_items(self):
+        available_menu_items = RestaurantMenuItem.objects.filter(
+            availability=True,
+            product__order_items__order=OuterRef('pk'),
+        )
+        return self.filter(Exists(available_menu_items))
+
 
 class Order(models.Model):
     STATUSES = (
@@ -197,6 +308,11 @@ class Order(models.Model):
         default=now,
         db_index=True
     )
+    updated_at = models.DateTimeField(
+        'Время изменения заказа',
+        auto_now=True,
+        db_index=True
+    )
     called_at = models.DateTimeField(
         'Время звонка',
         blank=True,
@@ -224,6 +340,13 @@ class Order(models.Model):
         null=True,
         blank=True
     )
+    total = models.DecimalField(
+        'Стоимость заказа',
+        max_digits=10,
+        decimal_places=2,
+        default=0,
+        db_index=True
+    )
     objects = OrderQuerySet.as_manager()
 
     class Meta:
@@ -233,6 +356,10 @@ class Order(models.Model):
     def __str__(self):
         return f'{self.id} {self.firstname} {self.lastname}, {self.address}'
 
+    def delete(self, *args, **kwargs):
+        with deleting_orders([self.id]):
+            return super().delete(*args, **kwargs)
+
 
 class OrderItem(models.Model):
     order = models.ForeignKey(
@@ -265,3 +392,95 @@ class OrderItem(models.Model):
 
     def __str__(self):
         return f"{self.product.name} - {self.quantity}"
+
+
+class OrderIntakeQuerySet(models.QuerySet):
+    def pending(self):
+        return self.filter(processed_at__isnull=True)
+
+
+class OrderIntake(models.Model):
+    payload = models.JSONField(
+        'Данные заказа',
+        encoder=DjangoJSONEncoder
+    )
+    accepted_at = models.DateTimeField(
+        'Время приёма',
+        default=now,
+        db_index=True
+    )
+    processed_at = models.DateTimeField(
+        'Время обработки',
+        blank=True,
+        null=True,
+        db_index=True
+    )
+    order = models.OneToOneField(
+        Order,
+        related_name='intake',
+        verbose_name='заказ',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True
+    )
+    errors = models.JSONField(
+        'Ошибки',
+        blank=True,
+        null=True
+    )
+    objects = OrderIntakeQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'Принятый заказ'
+        verbose_name_plural = 'Принятые заказы'
+
+    def __str__(self):
+        return f'{self.id} {self.accepted_at}'
+
+
+class IdempotencyKeyQuerySet(models.QuerySet):
+    def expired(self, ttl):
+        return self.filter(created_at__lt=now() - ttl)
+
+    def active(self, ttl):
+        return self.filter(created_at__gte=now() - ttl)
+
+
+class IdempotencyKey(models.Model):
+    key = models.CharField(
+        'Ключ идемпотентности',
+        max_length=255,
+        unique=True
+    )
+    request_hash = models.CharField(
+        'Хэш запроса',
+        max_length=64
+    )
+    order = models.ForeignKey(
+        Order,
+        related_name='idempotency_keys',
+        verbose_name='заказ',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True
+    )
+    response = models.JSONField(
+        'Ответ',
+        encoder=DjangoJSONEncoder
+    )
+    status_code = models.PositiveSmallIntegerField(
+        'Код ответа'
+    )
+    created_at = models.DateTimeField(
+        'Время создания',
+        default=now,
+        db_index=True
+    )
+    objects = IdempotencyKeyQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'Ключ идемпотентности'
+        verbose_name_plural = 'Ключи идемпотентности'
+
+    def __str__(self):
+        return self.key
@@ -0,0 +1,129 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from places.distances import get_distance_matrix
+from places.spatial import get_spatial_index
+from places.views import get_places_coordinates
+from star_burger.metrics import ORDER_RECOMMENDATIONS_CACHE
+
+from .cache_versions import bump_cache_version, get_cache_version
+from .models import Order, OrderItem, Restaurant
+
+
+RESTAURANTS_VERSION_CACHE_KEY = 'foodcartapp:restaurants_version'
+
+
+def get_recommendations_cache_key(order_id, version):
+    return (
+        f'foodcartapp:recommendations:{version}:{settings.DISTANCE_METHOD}:'
+        f'{settings.NEAREST_RESTAURANTS_COUNT}:{settings.NEAREST_RESTAURANTS_RADIUS}:{order_id}'
+    )
+
+
+def get_recommendations_cache_keys(orders_ids):
+    version = get_cache_version(RESTAURANTS_VERSION_CACHE_KEY)
+    return {order_id: get_recommendations_cache_key(order_id, version) for order_id in orders_ids}
+
+
+def compute_recommendations(orders):
+    recommendations = {}
+    if not orders:
+        return recommendations
+
+    restaurants_addresses = dict(Restaurant.objects.values_list('id', 'address'))
+    orders_restaurant_ids = (
+        Order.objects
+        .filter(id__in=[order.id for order in orders])
+        .get_able_to_cook_restaurant_ids()
+    )
+    places_coordinates, pending_places = get_places_coordinates(
+        [order.address for order in orders] + list(restaurants_addresses.values())
+    )
+    located_restaurants = {
+        restaurant_id: places_coordinates[address]
+        for restaurant_id, address in restaurants_addresses.items()
+        if places_coordinates[address]
+    }
+    spatial_index = get_spatial_index(located_restaurants)
+
+    for order in orders:
+        ranked_restaurants = []
+        pending_restaurant_ids = []
+        order_coordinates = places_coordinates[order.address]
+        able_to_cook_restaurant_ids = set(orders_restaurant_ids.get(order.id, []))
+        if order_coordinates:
+            nearest_restaurants = spatial_index.get_nearest(
+                *order_coordinates,
+                k=settings.NEAREST_RESTAURANTS_COUNT,
+                radius_km=settings.NEAREST_RESTAURANTS_RADIUS,
+                predicate=able_to_cook_restaurant_ids.__contains__,
+            )
+            nearest_restaurant_ids = [restaurant_id for restaurant_id, _ in nearest_restaurants]
+            distances = get_distance_matrix(
+                [order_coordinates],
+                [located_restaurants[restaurant_id] for restaurant_id in nearest_restaurant_ids],
+            )
+            for restaurant_id, distance in zip(nearest_restaurant_ids, distances[0].tolist()):
+                ranked_restaurants.append((restaurant_id, round(distance, 3)))
+            ranked_restaurants.sort(key=lambda restaurant: restaurant[1])
+
+        for restaurant_id in orders_restaurant_ids.get(order.id, []):
+            if order_coordinates and restaurant_id in located_restaurants:
+                continue
+            ranked_restaurants.append((restaurant_id, None))
+            if order.address in pending_places or restaurants_addresses[restaurant_id] in pending_places:
+                pending_restaurant_ids.append(restaurant_id)
+
+        recommendations[order.id] = {
+            'restaurants': ranked_restaurants,
+            'pending_restaurant_ids': pending_restaurant_ids,
+            'is_order_located': bool(order_coordinates),
+        }
+    return recommendations
+
+
+def is_cacheable(recommendation):
+    return recommendation['is_order_located']
+
+
+def get_orders_recommendations(orders):
+    cache_keys = get_recommendations_cache_keys([order.id for order in orders])
+    cached_recommendations = cache.get_many(cache_keys.values())
+    recommendations = {
+        order_id: cached_recommendations[cache_key]
+        for order_id, cache_key in cache_keys.items()
+        if cache_key in cached_recommendations
+    }
+    missed_orders = [order for order in orders if order.id not in recommendations]
+    ORDER_RECOMMENDATIONS_CACHE.labels('hit').inc(len(recommendations))
+    ORDER_RECOMMENDATIONS_CACHE.labels('miss').inc(len(missed_orders))
+
+    computed_recommendations = compute_recommendations(missed_orders)
+    cache.set_many(
+        {
+            cache_keys[order_id]: recommendation
+            for order_id, recommendation in computed_recommendations.items()
+            if is_cacheable(recommendation)
+        },
+        timeout=settings.ORDER_RECOMMENDATIONS_CACHE_TIMEOUT,
+    )
+    recommendations.update(computed_recommendations)
+    return recommendations
+
+
+def invalidate_orders_recommendations(orders_ids):
+    cache.delete_many(get_recommendations_cache_keys(orders_ids).values())
+
+
+def invalidate_products_recommendations(product_ids):
+    orders_ids = (
+        OrderItem.objects
+        .filter(product__in=product_ids, order__in=Order.objects.open())
+        .values_list('order', flat=True)
+        .distinct()
+    )
+    invalidate_orders_recommendations(list(orders_ids))
+
+
+def invalidate_recommendations():
+    bump_cache_version(RESTAURANTS_VERSION_CACHE_KEY)
@@ -0,0 +1,71 @@
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+from phonenumber_field.phonenumber import PhoneNumber
+from rest_framework.renderers import BaseRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class JSONEncoder(DjangoJSONEncoder):
+    def default(self, o):
+        if isinstance(o, PhoneNumber):
+            return str(o)
+        return super().default(o)
+
+
+_encoder = JSONEncoder()
+
+
+def dumps_with_stdlib(data, pretty=False):
+    if pretty:
+        return json.dumps(data, cls=JSONEncoder, ensure_ascii=False, indent=2).encode()
+    return json.dumps(data, cls=JSONEncoder, ensure_ascii=False, separators=(',', ':')).encode()
+
+
+def dumps_with_orjson(data, pretty=False):
+    options = orjson.OPT_PASSTHROUGH_DATETIME
+    if pretty:
+        options |= orjson.OPT_INDENT_2
+    return orjson.dumps(data, default=_encoder.default, option=options)
+
+
+def get_json_dumps(engine=None):
+    engine = engine or settings.JSON_ENGINE
+    if engine == 'orjson' and orjson is not None:
+        return dumps_with_orjson
+    return dumps_with_stdlib
+
+
+def dumps(data, pretty=False):
+    return get_json_dumps()(data, pretty)
+
+
+def is_pretty_requested(request):
+    return request.GET.get('pretty') == '1'
+
+
+def json_response(request, data, status=200):
+    return HttpResponse(
+        dumps(data, pretty=is_pretty_requested(request)),
+        content_type='application/json',
+        status=status,
+    )
+
+
+class JSONRenderer(BaseRenderer):
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        request = (renderer_context or {}).get('request')
+        return dumps(data, pretty=bool(request and is_pretty_requested(request)))
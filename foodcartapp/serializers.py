@@ -1,12 +1,64 @@
-from rest_framework.serializers import ModelSerializer
+from rest_framework.serializers import ListSerializer, ModelSerializer, PrimaryKeyRelatedField
 
-from foodcartapp.models import OrderItem, Order
+from foodcartapp.models import OrderItem, Order, Product
+
+
+def get_product_ids(products_data):
+    product_ids = set()
+    for product in products_data if isinstance(products_data, list) else []:
+        try:
+            product_ids.add(int(product['product']))
+        except (KeyError, TypeError, ValueError):
+            continue
+    return product_ids
+
+
+def get_orders_product_ids(orders_data):
+    product_ids = set()
+    for order_data in orders_data if isinstance(orders_data, list) else []:
+        if isinstance(order_data, dict):
+            product_ids |= get_product_ids(order_data.get('products'))
+    return product_ids
+
+
+class ProductField(PrimaryKeyRelatedField):
+    def to_internal_value(self, data):
+        products = self.context.get('products')
+        if products is None:
+            return super().to_internal_value(data)
+
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            product = products.get(int(data))
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        if product is None:
+            self.fail('does_not_exist', pk_value=data)
+        return product
+
+
+class ProductsListSerializer(ListSerializer):
+    def to_internal_value(self, data):
+        if 'products' not in self.context:
+            self.context['products'] = Product.objects.in_bulk(get_product_ids(data))
+        return super().to_internal_value(data)
 
 
 class ProductsSerializer(ModelSerializer):
+    product = ProductField(queryset=Product.objects.all())
+
     class Meta:
         model = OrderItem
         fields = ['product', 'quantity']
+        list_serializer_class = ProductsListSerializer
+
+
+class OrderListSerializer(ListSerializer):
+    def to_internal_value(self, data):
+        if 'products' not in self.context:
+            self.context['products'] = Product.objects.in_bulk(get_orders_product_ids(data))
+        return super().to_internal_value(data)
 
 
 class OrderSerializer(ModelSerializer):
@@ -15,3 +67,18 @@ class OrderSerializer(ModelSerializer):
     class Meta:
         model = Order
         fields = ['products', 'firstname', 'lastname', 'phonenumber', 'address']
+        list_serializer_class = OrderListSerializer
+
+
+def validate_orders(orders_data):
+    serializer = OrderSerializer(data=orders_data, many=True)
+    if serializer.is_valid():
+        return list(enumerate(serializer.validated_data)), {}
+
+    orders_errors = {index: errors for index, errors in enumerate(serializer.errors) if errors}
+    valid_orders = [
+        (index, serializer.child.run_validation(order_data))
+        for index, order_data in enumerate(orders_data)
+        if index not in orders_errors
+    ]
+    return valid_orders, orders_errors
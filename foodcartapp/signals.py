@@ -0,0 +1,148 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from places.addresses import normalize_address
+from places.models import Place
+from places.signals import places_geocoded
+from places.views import enqueue_addresses
+from star_burger.metrics import ORDER_CALL_DELAY, ORDER_STATUS_TRANSITIONS
+
+from .assignment import auto_assign_orders
+from .availability import invalidate_availability_index
+from .board import bump_orders_version
+from .catalogue import invalidate_catalogue
+from .models import (
+    Order,
+    OrderItem,
+    Product,
+    ProductCategory,
+    Restaurant,
+    RestaurantMenuItem,
+    is_order_being_deleted,
+)
+from .recommendations import (
+    invalidate_orders_recommendations,
+    invalidate_products_recommendations,
+    invalidate_recommendations,
+)
+
+
+@receiver(post_save, sender=RestaurantMenuItem)
+@receiver(post_delete, sender=RestaurantMenuItem)
+def invalidate_availability_on_menu_change(sender, **kwargs):
+    transaction.on_commit(invalidate_availability_index)
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+@receiver(post_save, sender=ProductCategory)
+@receiver(post_delete, sender=ProductCategory)
+@receiver(post_save, sender=RestaurantMenuItem)
+@receiver(post_delete, sender=RestaurantMenuItem)
+def invalidate_catalogue_on_change(sender, **kwargs):
+    transaction.on_commit(invalidate_catalogue)
+
+
+@receiver(post_save, sender=Order)
+@receiver(post_delete, sender=Order)
+def bump_orders_version_on_change(sender, **kwargs):
+    transaction.on_commit(bump_orders_version)
+
+
+@receiver(post_save, sender=Restaurant)
+def enqueue_restaurant_address(sender, instance, **kwargs):
+    enqueue_addresses([instance.address])
+
+
+@receiver(post_save, sender=OrderItem)
+@receiver(post_delete, sender=OrderItem)
+def update_order_total(sender, instance, **kwargs):
+    if is_order_being_deleted(instance.order_id):
+        return
+    Order.objects.filter(id=instance.order_id).update_totals()
+
+
+@receiver(post_save, sender=Order)
+def invalidate_recommendations_on_order_change(sender, instance, created, **kwargs):
+    is_reopened = instance._saved_status not in ['Unprocessed', 'In_procces']
+    if created or instance.address != instance._saved_address or is_reopened:
+        transaction.on_commit(lambda: invalidate_orders_recommendations([instance.id]))
+
+
+@receiver(post_delete, sender=Order)
+@receiver(post_save, sender=OrderItem)
+@receiver(post_delete, sender=OrderItem)
+def invalidate_order_recommendations(sender, instance, **kwargs):
+    if sender is OrderItem and is_order_being_deleted(instance.order_id):
+        return
+    order_id = instance.id if sender is Order else instance.order_id
+    transaction.on_commit(lambda: invalidate_orders_recommendations([order_id]))
+
+
+@receiver(post_init, sender=RestaurantMenuItem)
+def remember_menu_item_product(sender, instance, **kwargs):
+    instance._saved_product_id = instance.product_id
+
+
+@receiver(post_save, sender=RestaurantMenuItem)
+@receiver(post_delete, sender=RestaurantMenuItem)
+def invalidate_recommendations_on_menu_change(sender, instance, **kwargs):
+    product_ids = {instance.product_id, instance._saved_product_id} - {None}
+    transaction.on_commit(lambda: invalidate_products_recommendations(product_ids))
+    instance._saved_product_id = instance.product_id
+
+
+@receiver(post_init, sender=Restaurant)
+def remember_restaurant_address(sender, instance, **kwargs):
+    instance._saved_address = instance.address if instance.pk else None
+
+
+@receiver(post_save, sender=Restaurant)
+def invalidate_recommendations_on_restaurant_change(sender, instance, **kwargs):
+    if instance.address != instance._saved_address:
+        transaction.on_commit(invalidate_recommendations)
+    instance._saved_address = instance.address
+
+
+@receiver(post_delete, sender=Restaurant)
+@receiver(post_save, sender=Place)
+@receiver(post_delete, sender=Place)
+def invalidate_recommendations_on_change(sender, **kwargs):
+    transaction.on_commit(invalidate_recommendations)
+
+
+@receiver(places_geocoded)
+def invalidate_recommendations_on_restaurant_geocoding(sender, places, **kwargs):
+    normalized_addresses = {place.normalized_address for place in places}
+    restaurants_addresses = Restaurant.objects.values_list('address', flat=True)
+    if any(normalize_address(address) in normalized_addresses for address in restaurants_addresses):
+        invalidate_recommendations()
+
+
+@receiver(places_geocoded)
+def assign_orders_on_geocoding(sender, **kwargs):
+    if settings.ORDER_AUTO_ASSIGNMENT:
+        auto_assign_orders()
+
+
+@receiver(post_init, sender=Order)
+def remember_order_state(sender, instance, **kwargs):
+    instance._saved_status = instance.status if instance.pk else None
+    instance._saved_called_at = instance.called_at
+    instance._saved_address = instance.address
+
+
+@receiver(post_save, sender=Order)
+def track_order_state_changes(sender, instance, created, **kwargs):
+    if not created and instance.status != instance._saved_status:
+        transaction.on_commit(
+            ORDER_STATUS_TRANSITIONS.labels(instance._saved_status, instance.status).inc
+        )
+    if instance.called_at and not instance._saved_called_at:
+        call_delay = (instance.called_at - instance.registered_at).total_seconds()
+        transaction.on_commit(lambda: ORDER_CALL_DELAY.observe(max(call_delay, 0)))
+    instance._saved_status = instance.status
+    instance._saved_called_at = instance.called_at
+    instance._saved_address = instance.address
@@ -0,0 +1,30 @@
+from django.http import StreamingHttpResponse
+
+from .renderers import get_json_dumps
+
+
+STREAMING_CHUNK_SIZE = 64 * 1024
+
+
+def iter_json_array(items, chunk_size=STREAMING_CHUNK_SIZE):
+    dumps = get_json_dumps()
+    buffer = [b'[']
+    buffer_size = 1
+    separator = b''
+    for item in items:
+        dumped_item = separator + dumps(item)
+        separator = b','
+        buffer.append(dumped_item)
+        buffer_size += len(dumped_item)
+        if buffer_size >= chunk_size:
+            yield b''.join(buffer)
+            buffer = []
+            buffer_size = 0
+    buffer.append(b']')
+    yield b''.join(buffer)
+
+
+class StreamingJsonResponse(StreamingHttpResponse):
+    def __init__(self, items, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(iter_json_array(items), **kwargs)
@@ -0,0 +1,30 @@
+from decimal import Decimal
+
+from foodcartapp.models import Order, Product, Restaurant, RestaurantMenuItem
+
+
+CUSTOMER = {
+    'firstname': 'Иван',
+    'lastname': 'Петров',
+    'phonenumber': '+79161234567',
+    'address': 'Москва, Арбат, 2',
+}
+
+
+def create_product(name='Бургер'):
+    return Product.objects.create(name=name, price=Decimal('100'), image='burger.jpg')
+
+
+def create_restaurant_with_product(name='Ресторан', address='Москва, Тверская, 1'):
+    restaurant = Restaurant.objects.create(name=name, address=address)
+    product = create_product()
+    RestaurantMenuItem.objects.create(restaurant=restaurant, product=product)
+    return restaurant, product
+
+
+def get_order_payload(products, **fields):
+    return {'products': products, **CUSTOMER, **fields}
+
+
+def create_order(**fields):
+    return Order.objects.create(**{**CUSTOMER, **fields})
@@ -0,0 +1,32 @@
+import json
+
+from django.test import TestCase, override_settings
+
+from foodcartapp.catalogue import invalidate_catalogue
+from foodcartapp.tests.fixtures import create_restaurant_with_product
+
+
+class PrettyJsonTest(TestCase):
+    def setUp(self):
+        invalidate_catalogue()
+        create_restaurant_with_product()
+
+    def get_json(self, response):
+        if response.streaming:
+            return json.loads(b''.join(response.streaming_content))
+        return response.json()
+
+    def assertPrettyJson(self, url):
+        compact_response = self.client.get(url)
+        pretty_response = self.client.get(url, {'pretty': '1'})
+
+        self.assertEqual(pretty_response.status_code, 200)
+        self.assertIn(b'\n  ', pretty_response.content)
+        self.assertEqual(self.get_json(pretty_response), self.get_json(compact_response))
+
+    @override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+    def test_banners_list(self):
+        self.assertPrettyJson('/api/banners/')
+
+    def test_product_list(self):
+        self.assertPrettyJson('/api/products/')
@@ -0,0 +1,71 @@
+import json
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from foodcartapp.assignment import get_auction_assignment, get_comparison_report, get_greedy_assignment
+from foodcartapp.availability import invalidate_availability_index
+from foodcartapp.models import Order
+from foodcartapp.recommendations import invalidate_recommendations
+from foodcartapp.tests.fixtures import create_restaurant_with_product, get_order_payload
+from places.models import Place
+from places.views import geocode_pending_places
+
+
+@override_settings(ORDER_AUTO_ASSIGNMENT=True)
+class OrderAutoAssignmentTest(TestCase):
+    def setUp(self):
+        invalidate_availability_index()
+        invalidate_recommendations()
+        self.restaurant, self.product = create_restaurant_with_product()
+        Place.objects.update_or_create(
+            address='Москва, Тверская, 1',
+            defaults={'lon': 37.61, 'lat': 55.76, 'status': 'Resolved'},
+        )
+
+    def register_order(self):
+        order = get_order_payload([{'product': self.product.id, 'quantity': 1}])
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/order/', json.dumps(order), content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        return Order.objects.get(id=response.json()['id'])
+
+    def geocode_places(self):
+        coordinates = {'Москва, Арбат, 2': ('37.59', '55.75')}
+        with mock.patch('places.views.fetch_places_coordinates', return_value=coordinates), \
+                self.captureOnCommitCallbacks(execute=True):
+            geocode_pending_places(batch_size=10)
+
+    def test_registration_does_not_assign_order(self):
+        with mock.patch('foodcartapp.assignment.assign_orders') as assign_orders:
+            self.register_order()
+
+        assign_orders.assert_not_called()
+
+    def test_geocoded_order_is_assigned(self):
+        order = self.register_order()
+
+        self.geocode_places()
+
+        order.refresh_from_db()
+        self.assertEqual(order.responsible_restaurant, self.restaurant)
+        self.assertEqual(order.status, 'In_procces')
+
+    def test_assignment_error_is_logged(self):
+        self.register_order()
+
+        with mock.patch('foodcartapp.assignment.assign_orders', side_effect=RuntimeError), \
+                self.assertLogs('foodcartapp.assignment', level='ERROR'):
+            self.geocode_places()
+
+
+class AssignmentComparisonTest(SimpleTestCase):
+    def test_distance_saved_counts_orders_assigned_by_both_methods(self):
+        orders_candidates = {1: [(10, 1.0), (20, 2.0)], 2: [(10, 1.5)]}
+        free_slots = {10: 1, 20: 1}
+        greedy_assignment = get_greedy_assignment(orders_candidates, free_slots)
+        auction_assignment = get_auction_assignment(orders_candidates, free_slots, unassigned_penalty=100)
+
+        report = get_comparison_report(orders_candidates, greedy_assignment, auction_assignment)
+
+        self.assertEqual(report, {'distance_saved': -1.0, 'assigned_difference': 1})
@@ -0,0 +1,22 @@
+from django.core.cache import caches
+from django.test import SimpleTestCase
+
+from foodcartapp.cache_versions import bump_cache_version, get_cache_version
+
+
+class CacheVersionTest(SimpleTestCase):
+    def tearDown(self):
+        caches['versions'].delete('test-version')
+
+    def test_bump_changes_version(self):
+        version = get_cache_version('test-version')
+
+        self.assertEqual(bump_cache_version('test-version'), version + 1)
+        self.assertEqual(get_cache_version('test-version'), version + 1)
+
+    def test_evicted_version_does_not_repeat(self):
+        get_cache_version('test-version')
+        old_version = bump_cache_version('test-version')
+        caches['versions'].delete('test-version')
+
+        self.assertGreater(get_cache_version('test-version'), old_version)
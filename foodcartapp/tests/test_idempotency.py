@@ -0,0 +1,46 @@
+import json
+from unittest import mock
+
+from django.test import TestCase
+
+from foodcartapp.idempotency import get_stored_response
+from foodcartapp.models import IdempotencyKey, Order
+from foodcartapp.tests.fixtures import create_restaurant_with_product, get_order_payload
+
+
+class RegisterOrderIdempotencyTest(TestCase):
+    def setUp(self):
+        _, self.product = create_restaurant_with_product()
+
+    def post_order(self, idempotency_key):
+        order = get_order_payload([{'product': self.product.id, 'quantity': 1}])
+        return self.client.post(
+            '/api/order/',
+            json.dumps(order),
+            content_type='application/json',
+            HTTP_IDEMPOTENCY_KEY=idempotency_key,
+        )
+
+    def test_repeated_request_replays_response(self):
+        first_response = self.post_order('key-1')
+        second_response = self.post_order('key-1')
+
+        self.assertEqual(second_response.status_code, first_response.status_code)
+        self.assertEqual(second_response.json(), first_response.json())
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_concurrent_request_replays_winner_response(self):
+        first_response = self.post_order('key-1')
+        first_order_id = first_response.json()['id']
+
+        # The concurrent request looked the key up before the winner committed it.
+        with mock.patch(
+            'foodcartapp.views.get_stored_response',
+            side_effect=[None, get_stored_response('key-1')],
+        ):
+            second_response = self.post_order('key-1')
+
+        self.assertEqual(second_response.status_code, first_response.status_code)
+        self.assertEqual(second_response.json(), first_response.json())
+        self.assertEqual(Order.objects.count(), 1)
+        self.assertEqual(IdempotencyKey.objects.get(key='key-1').order_id, first_order_id)
@@ -0,0 +1,27 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+
+
+@override_settings(METRICS_TOKEN='secret', METRICS_ALLOWED_IPS=['127.0.0.1', '10.0.0.5'])
+class ViewMetricsTest(TestCase):
+    def test_anonymous_request_from_proxy_is_denied(self):
+        response = self.client.get('/metrics', REMOTE_ADDR='127.0.0.1')
+        self.assertEqual(response.status_code, 403)
+
+    def test_wrong_token_is_denied(self):
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer wrong')
+        self.assertEqual(response.status_code, 403)
+
+    def test_token_is_allowed(self):
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, 200)
+
+    def test_allowed_ip_is_allowed(self):
+        response = self.client.get('/metrics', REMOTE_ADDR='10.0.0.5')
+        self.assertEqual(response.status_code, 200)
+
+    def test_staff_is_allowed(self):
+        manager = get_user_model().objects.create_user('manager', is_staff=True)
+        self.client.force_login(manager)
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,123 @@
+import json
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from foodcartapp.models import Order, OrderItem
+from foodcartapp.tests.fixtures import (
+    create_order,
+    create_product,
+    create_restaurant_with_product,
+    get_order_payload,
+)
+from places.models import Place
+
+
+class RegisterOrderTest(TestCase):
+    def setUp(self):
+        _, self.product = create_restaurant_with_product()
+
+    def test_long_address_is_enqueued_for_geocoding(self):
+        address = 'Москва, ул. ' + 'Длинная' * 40
+        address = address[:Order._meta.get_field('address').max_length]
+        order = get_order_payload([{'product': self.product.id, 'quantity': 1}], address=address)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/order/', json.dumps(order), content_type='application/json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(Place.objects.filter(address=address).exists())
+
+
+class RegisterOrdersBatchTest(TestCase):
+    def setUp(self):
+        _, self.product = create_restaurant_with_product()
+
+    def post_orders(self):
+        orders = [get_order_payload([{'product': self.product.id, 'quantity': 1}])]
+        return self.client.post('/api/orders/batch/', json.dumps(orders), content_type='application/json')
+
+    def test_anonymous_client_is_rejected(self):
+        response = self.post_orders()
+
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(Order.objects.count(), 0)
+
+    def test_partner_can_register_orders(self):
+        self.client.force_login(User.objects.create_user('partner'))
+
+        response = self.post_orders()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Order.objects.count(), 1)
+
+
+class DeleteOrderTest(TestCase):
+    def setUp(self):
+        self.product = create_product()
+
+    def get_delete_queries_count(self, items_count):
+        order = create_order()
+        OrderItem.objects.bulk_create([
+            OrderItem(order=order, product=self.product, quantity=1, price=Decimal('100'))
+            for _ in range(items_count)
+        ])
+        with CaptureQueriesContext(connection) as queries:
+            order.delete()
+        return len(queries)
+
+    def test_order_items_do_not_update_deleted_order(self):
+        self.assertEqual(self.get_delete_queries_count(10), self.get_delete_queries_count(1))
+
+    def test_order_items_do_not_update_deleted_orders_queryset(self):
+        for _ in range(3):
+            self.get_delete_queries_count(1)
+        with CaptureQueriesContext(connection) as queries:
+            Order.objects.all().delete()
+
+        self.assertEqual(len([query for query in queries if query['sql'].startswith('UPDATE')]), 0)
+
+    def test_failed_delete_keeps_order_total_updated(self):
+        order = create_order()
+        order_item = OrderItem.objects.create(order=order, product=self.product, quantity=1, price=Decimal('100'))
+        with mock.patch('django.db.models.sql.DeleteQuery.delete_batch', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                order.delete()
+
+        order_item.delete()
+
+        order.refresh_from_db()
+        self.assertEqual(order.total, Decimal('0'))
+
+    def test_unchanged_total_keeps_updated_at(self):
+        order = create_order()
+        OrderItem.objects.create(order=order, product=self.product, quantity=1, price=Decimal('100'))
+        order.refresh_from_db()
+
+        self.assertEqual(Order.objects.filter(id=order.id).update_totals(), 0)
+        self.assertEqual(Order.objects.get(id=order.id).updated_at, order.updated_at)
+
+    def test_deleted_item_updates_order_total(self):
+        order = create_order()
+        OrderItem.objects.create(order=order, product=self.product, quantity=1, price=Decimal('100'))
+        order_item = OrderItem.objects.create(order=order, product=self.product, quantity=2, price=Decimal('100'))
+
+        order_item.delete()
+
+        order.refresh_from_db()
+        self.assertEqual(order.total, Decimal('100'))
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class OrderAdminTest(TestCase):
+    def test_total_is_read_only(self):
+        self.client.force_login(User.objects.create_superuser('admin'))
+        order = create_order()
+
+        response = self.client.get(f'/admin/foodcartapp/order/{order.id}/change/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('total', response.context['adminform'].form.fields)
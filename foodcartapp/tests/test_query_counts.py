@@ -0,0 +1,65 @@
+import json
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from foodcartapp.availability import invalidate_availability_index
+from foodcartapp.catalogue import invalidate_catalogue
+from foodcartapp.management.commands.benchmark_api import (
+    SYNTHETIC_NAME,
+    delete_synthetic_data,
+    fetch_stub_coordinates,
+    seed_synthetic_data,
+)
+from foodcartapp.recommendations import invalidate_recommendations
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+@mock.patch('places.views.fetch_coordinates', fetch_stub_coordinates)
+class EndpointsQueryCountTest(TestCase):
+    def setUp(self):
+        manager = get_user_model().objects.create_user('manager', is_staff=True)
+        self.manager_client = self.client_class()
+        self.manager_client.force_login(manager)
+
+    def get_queries_counts(self, restaurants_count, products_count, orders_count):
+        delete_synthetic_data()
+        products = seed_synthetic_data(restaurants_count, products_count, orders_count, menu_density=1, seed=1)
+        invalidate_availability_index()
+        invalidate_catalogue()
+        invalidate_recommendations()
+
+        order = {
+            'products': [{'product': product.id, 'quantity': 1} for product in products[:3]],
+            'firstname': SYNTHETIC_NAME,
+            'lastname': 'Клиент',
+            'phonenumber': '+79000000000',
+            'address': f'{SYNTHETIC_NAME} адрес, 1',
+        }
+        endpoints = {
+            'GET /api/products/': lambda: self.client.get('/api/products/'),
+            'POST /api/order/': lambda: self.client.post(
+                '/api/order/', json.dumps(order), content_type='application/json'
+            ),
+            'GET /manager/orders/': lambda: self.manager_client.get('/manager/orders/'),
+            'GET /manager/products/': lambda: self.manager_client.get('/manager/products/'),
+        }
+        queries_counts = {}
+        for name, send_request in endpoints.items():
+            send_request()
+            with CaptureQueriesContext(connection) as queries:
+                response = send_request()
+                if response.streaming:
+                    b''.join(response.streaming_content)
+            self.assertLess(response.status_code, 400, name)
+            queries_counts[name] = len(queries)
+        return queries_counts
+
+    def test_queries_count_does_not_grow_with_data(self, *args):
+        small_queries_counts = self.get_queries_counts(3, 5, 5)
+        large_queries_counts = self.get_queries_counts(6, 20, 40)
+
+        self.assertEqual(large_queries_counts, small_queries_counts)
@@ -0,0 +1,50 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.test import TestCase
+
+from foodcartapp.availability import invalidate_availability_index
+from foodcartapp.models import OrderItem, Restaurant, RestaurantMenuItem
+from foodcartapp.recommendations import get_orders_recommendations, invalidate_recommendations
+from foodcartapp.tests.fixtures import create_order, create_product
+from places.models import Place
+from places.views import geocode_pending_places
+
+
+class OrderRecommendationsCacheTest(TestCase):
+    def setUp(self):
+        invalidate_availability_index()
+        invalidate_recommendations()
+        product = create_product()
+        self.located_restaurant = Restaurant.objects.create(name='Ресторан 1', address='Москва, Тверская, 1')
+        self.pending_restaurant = Restaurant.objects.create(name='Ресторан 2', address='Москва, Арбат, 10')
+        for restaurant in [self.located_restaurant, self.pending_restaurant]:
+            RestaurantMenuItem.objects.create(restaurant=restaurant, product=product)
+        self.order = create_order(total=Decimal('100'))
+        OrderItem.objects.create(order=self.order, product=product, quantity=1, price=Decimal('100'))
+        Place.objects.update_or_create(
+            address='Москва, Тверская, 1',
+            defaults={'lon': 37.61, 'lat': 55.76, 'status': 'Resolved'},
+        )
+        Place.objects.update_or_create(
+            address='Москва, Арбат, 2',
+            defaults={'lon': 37.59, 'lat': 55.75, 'status': 'Resolved'},
+        )
+
+    def get_restaurants_distances(self):
+        recommendation = get_orders_recommendations([self.order])[self.order.id]
+        return dict(recommendation['restaurants'])
+
+    def test_recommendation_is_cached_until_restaurant_is_geocoded(self):
+        distances = self.get_restaurants_distances()
+        self.assertIsNone(distances[self.pending_restaurant.id])
+
+        with mock.patch('foodcartapp.recommendations.compute_recommendations') as compute_recommendations:
+            self.assertEqual(self.get_restaurants_distances(), distances)
+        compute_recommendations.assert_called_once_with([])
+
+        with mock.patch('places.views.fetch_places_coordinates', return_value={'Москва, Арбат, 10': ('37.60', '55.75')}), \
+                self.captureOnCommitCallbacks(execute=True):
+            geocode_pending_places(batch_size=10)
+
+        self.assertIsNotNone(self.get_restaurants_distances()[self.pending_restaurant.id])
@@ -0,0 +1,22 @@
+from django.test import TestCase
+
+from foodcartapp.serializers import OrderSerializer
+from foodcartapp.tests.fixtures import create_product, get_order_payload
+
+
+class OrderSerializerTest(TestCase):
+    def setUp(self):
+        self.products = [create_product(f'Бургер {number}') for number in range(1, 11)]
+
+    def test_boolean_product_is_rejected(self):
+        serializer = OrderSerializer(data=get_order_payload([{'product': True, 'quantity': 1}]))
+
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('product', serializer.errors['products'][0])
+
+    def test_products_are_loaded_in_one_query(self):
+        for products_count in (1, len(self.products)):
+            products = [{'product': product.id, 'quantity': 1} for product in self.products[:products_count]]
+            serializer = OrderSerializer(data=get_order_payload(products))
+            with self.assertNumQueries(1):
+                self.assertTrue(serializer.is_valid())
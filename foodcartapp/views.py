@@ -1,19 +1,28 @@
-from decimal import Decimal
-
-from django.db import transaction
-from django.http import JsonResponse
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse, StreamingHttpResponse
 from django.templatetags.static import static
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
 from rest_framework import status
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from .models import Product, OrderItem, Order
-from .serializers import OrderSerializer
+from places.views import enqueue_addresses
+from star_burger.compression import get_response_encoding
+from star_burger.metrics import ORDERS_REGISTERED
+
+from .catalogue import get_cached_catalogue, iter_and_cache_catalogue, iter_catalogue
+from .idempotency import get_request_hash, get_stored_response, store_response
+from .models import IdempotencyKey, Order, OrderIntake
+from .renderers import is_pretty_requested, json_response
+from .serializers import OrderSerializer, validate_orders
 
 
 def banners_list_api(request):
     # FIXME move data to db?
-    return JsonResponse([
+    return json_response(request, [
         {
             'title': 'Burger',
             'src': static('burger.jpg'),
@@ -29,67 +38,116 @@ def banners_list_api(request):
             'src': static('tasty.jpg'),
             'text': 'Food is incomplete without a tasty dessert',
         }
-    ], safe=False, json_dumps_params={
-        'ensure_ascii': False,
-        'indent': 4,
-    })
+    ])
 
 
 def product_list_api(request):
-    products = Product.objects.select_related('category').available()
-
-    dumped_products = []
-    for product in products:
-        dumped_product = {
-            'id': product.id,
-            'name': product.name,
-            'price': product.price,
-            'special_status': product.special_status,
-            'description': product.description,
-            'category': {
-                'id': product.category.id,
-                'name': product.category.name,
-            } if product.category else None,
-            'image': product.image.url,
-            'restaurant': {
-                'id': product.id,
-                'name': product.name,
-            }
-        }
-        dumped_products.append(dumped_product)
-    return JsonResponse(dumped_products, safe=False, json_dumps_params={
-        'ensure_ascii': False,
-        'indent': 4,
-    })
+    if is_pretty_requested(request):
+        return json_response(request, list(iter_catalogue()))
 
+    catalogue = get_cached_catalogue()
+    if catalogue is None:
+        return StreamingHttpResponse(iter_and_cache_catalogue(), content_type='application/json')
 
-@api_view(['POST'])
-@transaction.atomic
-def register_order(request):
-    serializer = OrderSerializer(data=request.data)
+    last_modified = int(catalogue['last_modified'])
+    response = get_conditional_response(
+        request,
+        etag=catalogue['etag'],
+        last_modified=last_modified,
+    )
+    compressed_payloads = catalogue.get('compressed_payloads', {})
+    encoding = get_response_encoding(request)
+    is_compressed = encoding in compressed_payloads
+    if response is None and is_compressed:
+        response = HttpResponse(compressed_payloads[encoding], content_type='application/json')
+        response['Content-Encoding'] = encoding
+    elif response is None:
+        response = HttpResponse(catalogue['payload'], content_type='application/json')
+    if compressed_payloads:
+        patch_vary_headers(response, ('Accept-Encoding',))
+    response['ETag'] = f'W/{catalogue["etag"]}' if is_compressed else catalogue['etag']
+    response['Last-Modified'] = http_date(last_modified)
+    return response
+
+
+def create_order(order_data):
+    serializer = OrderSerializer(data=order_data)
     serializer.is_valid(raise_exception=True)
+    transaction.on_commit(ORDERS_REGISTERED.labels('order', settings.ORDER_INTAKE_MODE).inc)
 
-    order = Order.objects.create(
-        firstname=serializer.validated_data['firstname'],
-        lastname=serializer.validated_data['lastname'],
-        phonenumber=serializer.validated_data['phonenumber'],
-        address=serializer.validated_data['address']
-    )
-    order_items = []
-    for product in serializer.validated_data['products']:
-        order_items.append(
-            OrderItem(
-                order=order,
-                product=product['product'],
-                quantity=product['quantity'],
-                price=Decimal(product['product'].price)
-            )
-        )
-    OrderItem.objects.bulk_create(order_items)
+    if settings.ORDER_INTAKE_MODE == 'buffered':
+        intake = OrderIntake.objects.create(payload=serializer.data)
+        serialized_data = serializer.data
+        serialized_data['intake_id'] = intake.id
+        return None, serialized_data, status.HTTP_202_ACCEPTED
+
+    order, = Order.objects.create_with_items([serializer.validated_data])
+    transaction.on_commit(lambda: enqueue_addresses([order.address]))
 
     serialized_data = serializer.data
     serialized_data['id'] = order.id
+    return order, serialized_data, status.HTTP_200_OK
+
+
+def get_idempotent_response(stored_response, request_hash):
+    if stored_response.request_hash != request_hash:
+        return Response(
+            {'non_field_errors': ['Ключ идемпотентности уже использован для другого запроса.']},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    return Response(stored_response.response, status=stored_response.status_code)
+
+
+@api_view(['POST'])
+def register_order(request):
+    idempotency_key = request.headers.get('Idempotency-Key')
+    if not idempotency_key:
+        with transaction.atomic():
+            _, serialized_data, response_status = create_order(request.data)
+        return Response(serialized_data, status=response_status)
+
+    if len(idempotency_key) > IdempotencyKey._meta.get_field('key').max_length:
+        return Response(
+            {'non_field_errors': ['Слишком длинный ключ идемпотентности.']},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
 
-    return Response(serialized_data, status=status.HTTP_200_OK)
+    request_hash = get_request_hash(request.data)
+    stored_response = get_stored_response(idempotency_key)
+    if stored_response:
+        return get_idempotent_response(stored_response, request_hash)
+
+    try:
+        with transaction.atomic():
+            order, serialized_data, response_status = create_order(request.data)
+            store_response(idempotency_key, request_hash, serialized_data, response_status, order)
+    except IntegrityError:
+        stored_response = get_stored_response(idempotency_key)
+        if not stored_response:
+            raise
+        return get_idempotent_response(stored_response, request_hash)
+
+    return Response(serialized_data, status=response_status)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def register_orders_batch(request):
+    if not isinstance(request.data, list):
+        return Response({'non_field_errors': ['Ожидается список заказов.']}, status=status.HTTP_400_BAD_REQUEST)
+    if len(request.data) > settings.ORDERS_BATCH_MAX_SIZE:
+        return Response(
+            {'non_field_errors': [f'В одном запросе не больше {settings.ORDERS_BATCH_MAX_SIZE} заказов.']},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
 
+    valid_orders, orders_errors = validate_orders(request.data)
+    with transaction.atomic():
+        orders = Order.objects.create_with_items([order_details for _, order_details in valid_orders])
+        transaction.on_commit(lambda: enqueue_addresses([order.address for order in orders]))
+        transaction.on_commit(lambda: ORDERS_REGISTERED.labels('batch', 'sync').inc(len(orders)))
 
+    results = [{'index': index, 'errors': errors} for index, errors in orders_errors.items()]
+    results.extend({'index': index, 'id': order.id} for (index, _), order in zip(valid_orders, orders))
+    results.sort(key=lambda result: result['index'])
+    return Response(results, status=status.HTTP_200_OK)
@@ -0,0 +1,42 @@
+import re
+
+
+ABBREVIATIONS = {
+    'ул': 'улица',
+    'пр': 'проспект',
+    'пр-т': 'проспект',
+    'просп': 'проспект',
+    'пр-д': 'проезд',
+    'пл': 'площадь',
+    'пер': 'переулок',
+    'б-р': 'бульвар',
+    'бул': 'бульвар',
+    'бульв': 'бульвар',
+    'наб': 'набережная',
+    'ш': 'шоссе',
+    'туп': 'тупик',
+    'мкр': 'микрорайон',
+    'мкрн': 'микрорайон',
+    'обл': 'область',
+    'р-н': 'район',
+    'корп': 'корпус',
+    'к': 'корпус',
+    'стр': 'строение',
+    'кв': 'квартира',
+    'эт': 'этаж',
+    'под': 'подъезд',
+}
+NOISE_WORDS = {'г', 'город', 'д', 'дом'}
+
+TOKEN_PATTERN = re.compile(r'\w+(?:-\w+)*')
+
+
+def normalize_address(address):
+    tokens = TOKEN_PATTERN.findall(address.casefold().replace('ё', 'е'))
+    normalized_tokens = []
+    for token in tokens:
+        token = ABBREVIATIONS.get(token, token)
+        if token in NOISE_WORDS:
+            continue
+        normalized_tokens.extend(token.split('-'))
+    return ' '.join(normalized_tokens)
@@ -4,4 +4,15 @@ from places.models import Place
 
 @admin.register(Place)
 class PlaceAdmin(admin.ModelAdmin):
-    pass
+    list_display = [
+        'address',
+        'status',
+        'attempts',
+        'next_attempt_at',
+    ]
+    list_filter = [
+        'status',
+    ]
+    search_fields = [
+        'address',
+    ]
@@ -0,0 +1,36 @@
+import numpy as np
+from django.conf import settings
+from geopy import distance
+
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def get_haversine_distances(origins, destinations):
+    origins = np.radians(np.asarray(origins, dtype=float).reshape(-1, 2))
+    destinations = np.radians(np.asarray(destinations, dtype=float).reshape(-1, 2))
+    origins_lon, origins_lat = origins[:, 0, np.newaxis], origins[:, 1, np.newaxis]
+    destinations_lon, destinations_lat = destinations[:, 0], destinations[:, 1]
+
+    haversine = (
+        np.sin((destinations_lat - origins_lat) / 2) ** 2
+        + np.cos(origins_lat) * np.cos(destinations_lat) * np.sin((destinations_lon - origins_lon) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(haversine, 0, 1)))
+
+
+def get_geodesic_distances(origins, destinations):
+    distances = np.empty((len(origins), len(destinations)))
+    for row, (origin_lon, origin_lat) in enumerate(origins):
+        for column, (destination_lon, destination_lat) in enumerate(destinations):
+            distances[row, column] = distance.distance(
+                (origin_lat, origin_lon),
+                (destination_lat, destination_lon),
+            ).km
+    return distances
+
+
+def get_distance_matrix(origins, destinations):
+    if settings.DISTANCE_METHOD == 'geodesic':
+        return get_geodesic_distances(origins, destinations)
+    return get_haversine_distances(origins, destinations)
@@ -0,0 +1,52 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from places.distances import get_geodesic_distances, get_haversine_distances
+
+
+def get_random_coordinates(rnd, count):
+    return [
+        (rnd.uniform(37.3, 37.9), rnd.uniform(55.5, 56.0))
+        for _ in range(count)
+    ]
+
+
+class Command(BaseCommand):
+    help = 'Сравнивает скорость расчёта матрицы расстояний между заказами и ресторанами'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--orders', type=int, default=2000)
+        parser.add_argument('--restaurants', type=int, default=300)
+        parser.add_argument(
+            '--geodesic-orders',
+            type=int,
+            default=50,
+            help='Для скольких заказов считать точные расстояния: они считаются очень долго',
+        )
+        parser.add_argument('--seed', type=int, default=1)
+
+    def handle(self, *args, **options):
+        rnd = random.Random(options['seed'])
+        orders = get_random_coordinates(rnd, options['orders'])
+        restaurants = get_random_coordinates(rnd, options['restaurants'])
+        geodesic_orders = orders[:options['geodesic_orders']]
+
+        started_at = time.perf_counter()
+        haversine_distances = get_haversine_distances(orders, restaurants)
+        haversine_elapsed = time.perf_counter() - started_at
+
+        started_at = time.perf_counter()
+        geodesic_distances = get_geodesic_distances(geodesic_orders, restaurants)
+        geodesic_elapsed = time.perf_counter() - started_at
+        geodesic_projected = geodesic_elapsed * len(orders) / max(len(geodesic_orders), 1)
+
+        max_error = abs(haversine_distances[:len(geodesic_orders)] - geodesic_distances).max(initial=0)
+        self.stdout.write(f'Пар заказ-ресторан: {len(orders) * len(restaurants)}')
+        self.stdout.write(f'haversine: {haversine_elapsed:.3f} с')
+        self.stdout.write(
+            f'geodesic: {geodesic_elapsed:.3f} с на {len(geodesic_orders)} заказов, '
+            f'для всех заказов ~{geodesic_projected:.1f} с'
+        )
+        self.stdout.write(f'Максимальное расхождение haversine и geodesic: {max_error * 1000:.1f} м')
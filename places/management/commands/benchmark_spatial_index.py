@@ -0,0 +1,59 @@
+import random
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from places.distances import get_haversine_distances
+from places.management.commands.benchmark_distances import get_random_coordinates
+from places.spatial import SpatialIndex
+
+
+class Command(BaseCommand):
+    help = 'Сравнивает поиск ближайших ресторанов по k-d дереву с перебором всех пар'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--restaurants', type=int, default=10000)
+        parser.add_argument('--orders', type=int, default=2000)
+        parser.add_argument('--nearest', type=int, default=5)
+        parser.add_argument('--radius', type=float, default=None)
+        parser.add_argument('--seed', type=int, default=1)
+
+    def handle(self, *args, **options):
+        rnd = random.Random(options['seed'])
+        restaurants = dict(enumerate(get_random_coordinates(rnd, options['restaurants'])))
+        orders = get_random_coordinates(rnd, options['orders'])
+        nearest_count = options['nearest']
+
+        started_at = time.perf_counter()
+        spatial_index = SpatialIndex(restaurants)
+        build_elapsed = time.perf_counter() - started_at
+
+        started_at = time.perf_counter()
+        nearest_by_index = [
+            spatial_index.get_nearest(lon, lat, nearest_count, options['radius'])
+            for lon, lat in orders
+        ]
+        index_elapsed = time.perf_counter() - started_at
+
+        started_at = time.perf_counter()
+        distances = get_haversine_distances(orders, list(restaurants.values()))
+        nearest_by_matrix = np.argsort(distances, axis=1)[:, :nearest_count]
+        matrix_elapsed = time.perf_counter() - started_at
+
+        mismatches = 0
+        for order_number, found in enumerate(nearest_by_index):
+            expected = [
+                restaurant_id for restaurant_id in nearest_by_matrix[order_number].tolist()
+                if options['radius'] is None or distances[order_number, restaurant_id] <= options['radius']
+            ]
+            mismatches += [restaurant_id for restaurant_id, _ in found] != expected
+
+        self.stdout.write(f'Ресторанов: {len(restaurants)}, заказов: {len(orders)}, ближайших: {nearest_count}')
+        self.stdout.write(f'Построение дерева: {build_elapsed:.3f} с')
+        self.stdout.write(
+            f'k-d дерево: {index_elapsed:.3f} с, '
+            f'{index_elapsed / max(len(orders), 1) * 1000:.3f} мс на заказ'
+        )
+        self.stdout.write(f'Матрица всех пар и сортировка: {matrix_elapsed:.3f} с')
+        self.stdout.write(f'Расхождений с перебором: {mismatches}')
@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from places.views import geocode_pending_places, get_geocoding_queue_stats
+
+
+class Command(BaseCommand):
+    help = 'Геокодирует адреса из очереди и сохраняет их координаты'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--loop', action='store_true', help='Не завершаться, а ждать новые адреса')
+        parser.add_argument('--sleep', type=float, default=5, help='Пауза в секундах, когда очередь пуста')
+        parser.add_argument('--stats', action='store_true', help='Показать размер очереди и выйти')
+
+    def handle(self, *args, **options):
+        if options['stats']:
+            self.write_stats()
+            return
+
+        while True:
+            geocoded_places_count = geocode_pending_places(options['batch_size'])
+            if geocoded_places_count:
+                self.stdout.write(f'Обработано адресов: {geocoded_places_count}')
+                self.write_stats()
+            elif not options['loop']:
+                return
+            else:
+                time.sleep(options['sleep'])
+
+    def write_stats(self):
+        stats = get_geocoding_queue_stats()
+        self.stdout.write(
+            f'В очереди: {stats["depth"]}, ждёт дольше всех: {stats["lag"]:.0f} с, '
+            f'не найдено или с ошибкой: {stats["failed"]}, из них пора повторить: {stats["retries_due"]}'
+        )
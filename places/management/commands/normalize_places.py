@@ -0,0 +1,88 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from foodcartapp.models import Order
+from places.addresses import normalize_address
+from places.models import Place
+
+
+def fill_normalized_addresses():
+    changed_places = []
+    for place in Place.objects.only('address', 'normalized_address').iterator(chunk_size=2000):
+        normalized_address = normalize_address(place.address)
+        if place.normalized_address != normalized_address:
+            place.normalized_address = normalized_address
+            changed_places.append(place)
+    Place.objects.bulk_update(changed_places, ['normalized_address'], batch_size=2000)
+    return len(changed_places)
+
+
+def merge_duplicate_places():
+    duplicated_addresses = (
+        Place.objects
+        .values('normalized_address')
+        .annotate(places_count=Count('id'))
+        .filter(places_count__gt=1)
+        .values_list('normalized_address', flat=True)
+    )
+    duplicates_ids = []
+    places = (
+        Place.objects
+        .filter(normalized_address__in=list(duplicated_addresses))
+        .order_by('normalized_address', 'id')
+    )
+    best_places = {}
+    for place in places:
+        best_place = best_places.get(place.normalized_address)
+        if not best_place:
+            best_places[place.normalized_address] = place
+        elif place.status == 'Resolved' and best_place.status != 'Resolved':
+            duplicates_ids.append(best_place.id)
+            best_places[place.normalized_address] = place
+        else:
+            duplicates_ids.append(place.id)
+    Place.objects.filter(id__in=duplicates_ids).delete()
+    return len(duplicates_ids)
+
+
+def replay_orders_addresses():
+    exact_addresses = set()
+    normalized_addresses = set()
+    exact_hits = normalized_hits = lookups = 0
+    orders_addresses = Order.objects.order_by('registered_at', 'id').values_list('address', flat=True)
+    for address in orders_addresses.iterator(chunk_size=2000):
+        lookups += 1
+        normalized_address = normalize_address(address)
+        exact_hits += address in exact_addresses
+        normalized_hits += normalized_address in normalized_addresses
+        exact_addresses.add(address)
+        normalized_addresses.add(normalized_address)
+    return lookups, exact_hits, normalized_hits
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает нормализованные адреса мест и склеивает дубликаты'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--replay',
+            action='store_true',
+            help='Прогнать адреса прошлых заказов и сравнить попадания в кэш до и после нормализации',
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            changed_places_count = fill_normalized_addresses()
+            merged_places_count = merge_duplicate_places()
+        self.stdout.write(f'Обновлено адресов: {changed_places_count}, удалено дубликатов: {merged_places_count}')
+
+        if options['replay']:
+            lookups, exact_hits, normalized_hits = replay_orders_addresses()
+            if not lookups:
+                self.stdout.write('Заказов нет')
+                return
+            self.stdout.write(
+                f'Заказов: {lookups}, попаданий в кэш по точному адресу: {exact_hits / lookups:.1%}, '
+                f'по нормализованному: {normalized_hits / lookups:.1%}'
+            )
@@ -0,0 +1,24 @@
+# Generated by Django 3.2.15 on 2026-10-18 18:42
+
+from django.db import migrations, models
+
+
+def mark_geocoded_places_resolved(apps, schema_editor):
+    Place = apps.get_model('places', 'Place')
+    Place.objects.filter(lon__isnull=False, lat__isnull=False).update(status='Resolved')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('places', '0004_auto_20220606_0800'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='place',
+            name='status',
+            field=models.CharField(choices=[('Pending', 'Ожидает геокодирования'), ('Resolved', 'Координаты найдены'), ('Not_found', 'Адрес не найден')], db_index=True, default='Pending', max_length=15, verbose_name='Статус геокодирования'),
+        ),
+        migrations.RunPython(mark_geocoded_places_resolved, migrations.RunPython.noop),
+    ]
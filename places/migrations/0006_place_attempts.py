@@ -0,0 +1,28 @@
+# Generated by Django 3.2.15 on 2026-10-18 18:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('places', '0005_place_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='place',
+            name='attempts',
+            field=models.PositiveIntegerField(default=0, verbose_name='Попыток геокодирования'),
+        ),
+        migrations.AddField(
+            model_name='place',
+            name='next_attempt_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True, verbose_name='Время следующей попытки'),
+        ),
+        migrations.AlterField(
+            model_name='place',
+            name='status',
+            field=models.CharField(choices=[('Pending', 'Ожидает геокодирования'), ('Resolved', 'Координаты найдены'), ('Not_found', 'Адрес не найден'), ('Failed', 'Ошибка геокодера')], db_index=True, default='Pending', max_length=15, verbose_name='Статус геокодирования'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 3.2.15 on 2026-10-18 18:44
+
+from django.db import migrations, models
+
+from places.addresses import normalize_address
+
+
+def fill_normalized_addresses(apps, schema_editor):
+    Place = apps.get_model('places', 'Place')
+    places = []
+    for place in Place.objects.only('address').iterator(chunk_size=2000):
+        place.normalized_address = normalize_address(place.address)
+        places.append(place)
+    Place.objects.bulk_update(places, ['normalized_address'], batch_size=2000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('places', '0006_place_attempts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='place',
+            name='normalized_address',
+            field=models.CharField(blank=True, db_index=True, max_length=1000, verbose_name='Нормализованный адрес'),
+        ),
+        migrations.RunPython(fill_normalized_addresses, migrations.RunPython.noop),
+    ]
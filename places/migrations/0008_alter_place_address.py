@@ -0,0 +1,18 @@
+# Generated by Django 3.2.15 on 2026-10-18 19:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('places', '0007_place_normalized_address'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='place',
+            name='address',
+            field=models.CharField(max_length=250, unique=True, verbose_name='Адрес'),
+        ),
+    ]
@@ -1,13 +1,27 @@
 from django.db import models
 from django.utils.timezone import now
 
+from places.addresses import normalize_address
+
 
 class Place(models.Model):
+    STATUSES = (
+        ('Pending', 'Ожидает геокодирования'),
+        ('Resolved', 'Координаты найдены'),
+        ('Not_found', 'Адрес не найден'),
+        ('Failed', 'Ошибка геокодера'),
+    )
     address = models.CharField(
         'Адрес',
-        max_length=200,
+        max_length=250,
         unique=True
     )
+    normalized_address = models.CharField(
+        'Нормализованный адрес',
+        max_length=1000,
+        blank=True,
+        db_index=True
+    )
     lon = models.FloatField(
         'Долгота',
         null=True,
@@ -18,6 +32,23 @@ class Place(models.Model):
         null=True,
         blank=True
     )
+    status = models.CharField(
+        'Статус геокодирования',
+        max_length=15,
+        choices=STATUSES,
+        default='Pending',
+        db_index=True
+    )
+    attempts = models.PositiveIntegerField(
+        'Попыток геокодирования',
+        default=0
+    )
+    next_attempt_at = models.DateTimeField(
+        'Время следующей попытки',
+        blank=True,
+        null=True,
+        db_index=True
+    )
     saved_at = models.DateTimeField(
         'Время сохранения места в дб',
         default=now,
@@ -30,3 +61,7 @@ class Place(models.Model):
 
     def __str__(self):
         return self.address
+
+    def save(self, *args, **kwargs):
+        self.normalized_address = normalize_address(self.address)
+        super().save(*args, **kwargs)
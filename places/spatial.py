@@ -0,0 +1,106 @@
+import heapq
+import itertools
+import math
+
+import numpy as np
+
+from places.distances import EARTH_RADIUS_KM
+
+
+LEAF_SIZE = 16
+
+_spatial_index = None
+
+
+def get_unit_vectors(coordinates):
+    coordinates = np.radians(np.asarray(coordinates, dtype=float).reshape(-1, 2))
+    lon, lat = coordinates[:, 0], coordinates[:, 1]
+    return np.column_stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)])
+
+
+def get_chord(distance_km):
+    return 2 * math.sin(min(distance_km / EARTH_RADIUS_KM, math.pi) / 2)
+
+
+def get_distance_km(chord):
+    return 2 * EARTH_RADIUS_KM * math.asin(min(chord / 2, 1))
+
+
+class KDNode:
+    __slots__ = ('lower', 'upper', 'left', 'right', 'indices')
+
+    def __init__(self, points, indices):
+        node_points = points[indices]
+        self.lower = node_points.min(axis=0)
+        self.upper = node_points.max(axis=0)
+        self.left = self.right = self.indices = None
+        if len(indices) <= LEAF_SIZE:
+            self.indices = indices
+            return
+
+        axis = np.argmax(self.upper - self.lower)
+        sorted_indices = indices[np.argsort(node_points[:, axis], kind='stable')]
+        middle = len(sorted_indices) // 2
+        self.left = KDNode(points, sorted_indices[:middle])
+        self.right = KDNode(points, sorted_indices[middle:])
+
+    def get_squared_distance(self, point):
+        gaps = np.maximum(np.maximum(self.lower - point, point - self.upper), 0)
+        return float(gaps @ gaps)
+
+
+class SpatialIndex:
+    def __init__(self, points):
+        self.points = dict(points)
+        self.ids = list(self.points)
+        self.vectors = get_unit_vectors([self.points[point_id] for point_id in self.ids])
+        self.root = KDNode(self.vectors, np.arange(len(self.ids))) if self.ids else None
+
+    def get_nearest(self, lon, lat, k, radius_km=None, predicate=None):
+        if self.root is None or k <= 0:
+            return []
+
+        point = get_unit_vectors([(lon, lat)])[0]
+        max_squared_chord = get_chord(radius_km) ** 2 if radius_km is not None else math.inf
+        nearest = []
+        counter = itertools.count()
+        nodes = [(0.0, next(counter), self.root)]
+        while nodes:
+            squared_distance, _, node = heapq.heappop(nodes)
+            bound = -nearest[0][0] if len(nearest) == k else max_squared_chord
+            if squared_distance > bound:
+                break
+
+            if node.indices is None:
+                for child in (node.left, node.right):
+                    child_squared_distance = child.get_squared_distance(point)
+                    if child_squared_distance <= bound:
+                        heapq.heappush(nodes, (child_squared_distance, next(counter), child))
+                continue
+
+            squared_distances = ((self.vectors[node.indices] - point) ** 2).sum(axis=1)
+            for index, squared_distance in zip(node.indices.tolist(), squared_distances.tolist()):
+                if squared_distance > bound:
+                    continue
+                point_id = self.ids[index]
+                if predicate and not predicate(point_id):
+                    continue
+                if len(nearest) < k:
+                    heapq.heappush(nearest, (-squared_distance, point_id))
+                else:
+                    heapq.heappushpop(nearest, (-squared_distance, point_id))
+                if len(nearest) == k:
+                    bound = -nearest[0][0]
+
+        return [
+            (point_id, get_distance_km(math.sqrt(-negative_squared_distance)))
+            for negative_squared_distance, point_id in sorted(nearest, reverse=True)
+        ]
+
+
+def get_spatial_index(points):
+    global _spatial_index
+
+    if _spatial_index is None or _spatial_index.points != points:
+        _spatial_index = SpatialIndex(points)
+    return _spatial_index
@@ -0,0 +1,24 @@
+from django.test import SimpleTestCase
+
+from places.addresses import normalize_address
+from places.models import Place
+
+
+class NormalizeAddressTest(SimpleTestCase):
+    def test_abbreviations_are_expanded(self):
+        self.assertEqual(
+            normalize_address('г. Москва, ул. Тверская, д. 1, к. 2'),
+            'москва улица тверская 1 корпус 2',
+        )
+
+    def test_expanded_address_fits_field(self):
+        max_length = Place._meta.get_field('address').max_length
+        address = 'к,' * (max_length // 2)
+
+        normalized_address = normalize_address(address)
+
+        self.assertGreater(len(normalized_address), max_length)
+        self.assertLessEqual(
+            len(normalized_address),
+            Place._meta.get_field('normalized_address').max_length,
+        )
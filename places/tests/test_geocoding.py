@@ -0,0 +1,93 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from places.models import Place
+from places.views import claim_places_to_geocode, geocode_pending_places
+
+
+class GeocodePendingPlacesTest(TestCase):
+    def test_claimed_places_are_skipped_by_other_workers(self):
+        place = Place.objects.create(address='Москва, Арбат, 2')
+
+        self.assertEqual(claim_places_to_geocode(batch_size=10), [place])
+        self.assertEqual(claim_places_to_geocode(batch_size=10), [])
+
+    def test_geocoder_is_called_outside_transaction(self):
+        Place.objects.create(address='Москва, Арбат, 2')
+        test_savepoints_count = len(connection.savepoint_ids)
+
+        def fetch_places_coordinates(addresses):
+            self.assertEqual(len(connection.savepoint_ids), test_savepoints_count)
+            self.assertIsNotNone(Place.objects.get().next_attempt_at)
+            return {address: ('37.59', '55.75') for address in addresses}
+
+        with mock.patch('places.views.fetch_places_coordinates', fetch_places_coordinates):
+            geocode_pending_places(batch_size=10)
+
+        place = Place.objects.get()
+        self.assertEqual(place.status, 'Resolved')
+        self.assertIsNone(place.next_attempt_at)
+
+
+class StubGeocoderHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        address = parse_qs(urlparse(self.path).query)['geocode'][0]
+        if address == 'Медленный адрес':
+            time.sleep(1)
+        if address == 'Адрес с ошибкой':
+            self.send_response(500)
+            self.end_headers()
+            return
+
+        found_places = []
+        if address == 'Москва, Арбат, 2':
+            found_places.append({'GeoObject': {'Point': {'pos': '37.59 55.75'}}})
+        content = json.dumps({'response': {'GeoObjectCollection': {'featureMember': found_places}}}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubGeocoderTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StubGeocoderHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def test_places_statuses(self):
+        addresses = ['Москва, Арбат, 2', 'Несуществующий адрес', 'Адрес с ошибкой', 'Медленный адрес']
+        for address in addresses:
+            Place.objects.create(address=address)
+
+        geocoder_url = f'http://127.0.0.1:{self.server.server_port}/1.x'
+        with override_settings(YA_GEOCODER_URL=geocoder_url, GEOCODER_TIMEOUT=0.2), \
+                self.assertLogs('places.views', level='ERROR'):
+            geocode_pending_places(batch_size=10)
+
+        places = {place.address: place for place in Place.objects.all()}
+        self.assertEqual(places['Москва, Арбат, 2'].status, 'Resolved')
+        self.assertEqual((places['Москва, Арбат, 2'].lon, places['Москва, Арбат, 2'].lat), (37.59, 55.75))
+        self.assertEqual(places['Несуществующий адрес'].status, 'Not_found')
+        self.assertEqual(places['Адрес с ошибкой'].status, 'Failed')
+        self.assertEqual(places['Медленный адрес'].status, 'Failed')
+        for address in ['Несуществующий адрес', 'Адрес с ошибкой', 'Медленный адрес']:
+            self.assertIsNotNone(places[address].next_attempt_at)
@@ -0,0 +1,59 @@
+import random
+
+from django.test import SimpleTestCase
+
+from places.distances import get_haversine_distances
+from places.management.commands.benchmark_distances import get_random_coordinates
+from places.spatial import SpatialIndex
+
+
+class SpatialIndexTest(SimpleTestCase):
+    def setUp(self):
+        rnd = random.Random(1)
+        self.points = dict(enumerate(get_random_coordinates(rnd, 500)))
+        self.orders = get_random_coordinates(rnd, 50)
+        self.spatial_index = SpatialIndex(self.points)
+
+    def get_brute_force_nearest(self, lon, lat, k, radius_km=None, predicate=None):
+        distances = get_haversine_distances([(lon, lat)], list(self.points.values()))[0].tolist()
+        nearest = [
+            (point_id, distance)
+            for point_id, distance in zip(self.points, distances)
+            if (radius_km is None or distance <= radius_km) and (predicate is None or predicate(point_id))
+        ]
+        nearest.sort(key=lambda point: point[1])
+        return nearest[:k]
+
+    def assertSameNearest(self, nearest, expected_nearest):
+        self.assertEqual([point_id for point_id, _ in nearest], [point_id for point_id, _ in expected_nearest])
+        for (_, distance), (_, expected_distance) in zip(nearest, expected_nearest):
+            self.assertAlmostEqual(distance, expected_distance, places=6)
+
+    def test_nearest_matches_brute_force(self):
+        for lon, lat in self.orders:
+            for k in (1, 5, 50):
+                self.assertSameNearest(
+                    self.spatial_index.get_nearest(lon, lat, k),
+                    self.get_brute_force_nearest(lon, lat, k),
+                )
+
+    def test_radius_matches_brute_force(self):
+        for lon, lat in self.orders:
+            for radius_km in (1, 5, 20):
+                self.assertSameNearest(
+                    self.spatial_index.get_nearest(lon, lat, len(self.points), radius_km=radius_km),
+                    self.get_brute_force_nearest(lon, lat, len(self.points), radius_km=radius_km),
+                )
+
+    def test_predicate_matches_brute_force(self):
+        def is_even(point_id):
+            return point_id % 2 == 0
+
+        for lon, lat in self.orders:
+            self.assertSameNearest(
+                self.spatial_index.get_nearest(lon, lat, 5, radius_km=10, predicate=is_even),
+                self.get_brute_force_nearest(lon, lat, 5, radius_km=10, predicate=is_even),
+            )
+
+    def test_empty_index(self):
+        self.assertEqual(SpatialIndex({}).get_nearest(37.6, 55.7, 5), [])
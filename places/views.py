@@ -1,17 +1,51 @@
+import logging
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextvars import copy_context
+from datetime import timedelta
+
 import requests
 from django.conf import settings
+from django.db import transaction
+from django.db.models import Min, Q
+from django.utils.timezone import now
+from requests.adapters import HTTPAdapter
 
+from places.addresses import normalize_address
 from places.models import Place
+from places.signals import places_geocoded
+from star_burger.instrumentation import track
+from star_burger.metrics import PLACES_LOOKUPS
+
+
+logger = logging.getLogger(__name__)
+
+_geocoder_session = None
+
+
+def get_geocoder_session():
+    global _geocoder_session
+
+    if _geocoder_session is None:
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=settings.GEOCODER_MAX_WORKERS,
+        )
+        _geocoder_session = requests.Session()
+        _geocoder_session.mount('https://', adapter)
+        _geocoder_session.mount('http://', adapter)
+    return _geocoder_session
 
 
 def fetch_coordinates(address):
     apikey = settings.YA_API_KEY
-    base_url = "https://geocode-maps.yandex.ru/1.x"
-    response = requests.get(base_url, params={
-        "geocode": address,
-        "apikey": apikey,
-        "format": "json",
-    })
+    base_url = settings.YA_GEOCODER_URL
+    with track('geocoder'):
+        response = get_geocoder_session().get(base_url, params={
+            "geocode": address,
+            "apikey": apikey,
+            "format": "json",
+        }, timeout=settings.GEOCODER_TIMEOUT)
     response.raise_for_status()
     found_places = response.json()['response']['GeoObjectCollection']['featureMember']
     if not found_places:
@@ -22,25 +56,143 @@ def fetch_coordinates(address):
     return lon, lat
 
 
-def get_serialized_places_and_coordinates(order_places):
-    places_and_coordinates = {}
-    for place in Place.objects.filter(address__in=order_places):
-        places_and_coordinates[place.address] = [place.lon, place.lat]
-
-    serialized_places_and_coordinates = {}
-    for place in order_places:
-        if place not in places_and_coordinates:
-            place_coordinates = fetch_coordinates(place)
-            serialized_places_and_coordinates[place] = None
-            if place_coordinates:
-                lon, lat = place_coordinates
-                Place.objects.get_or_create(
-                    address=place,
-                    lon=lon,
-                    lat=lat,
-                )
-                serialized_places_and_coordinates[place] = [place_coordinates]
+def fetch_places_coordinates(addresses):
+    places_coordinates = {}
+    if not addresses:
+        return places_coordinates
+
+    max_workers = min(settings.GEOCODER_MAX_WORKERS, len(addresses))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(copy_context().run, fetch_coordinates, address): address
+            for address in addresses
+        }
+        for future in as_completed(futures):
+            address = futures[future]
+            try:
+                places_coordinates[address] = future.result()
+            except (requests.RequestException, KeyError, ValueError):
+                logger.exception('Не удалось получить координаты адреса %s', address)
+    return places_coordinates
+
+
+def enqueue_addresses(addresses):
+    normalized_addresses = {}
+    for address in addresses:
+        normalized_address = normalize_address(address)
+        if normalized_address:
+            normalized_addresses.setdefault(normalized_address, address)
+    if not normalized_addresses:
+        return
+
+    known_addresses = set(
+        Place.objects
+        .filter(normalized_address__in=normalized_addresses)
+        .values_list('normalized_address', flat=True)
+    )
+    Place.objects.bulk_create(
+        [
+            Place(address=address, normalized_address=normalized_address)
+            for normalized_address, address in normalized_addresses.items()
+            if normalized_address not in known_addresses
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def get_next_attempt_at(attempts):
+    retry_delay = min(
+        settings.GEOCODER_RETRY_DELAY * 2 ** (attempts - 1),
+        settings.GEOCODER_MAX_RETRY_DELAY,
+    )
+    return now() + timedelta(seconds=retry_delay)
+
+
+def get_places_to_geocode():
+    return Place.objects.filter(
+        Q(status='Pending', next_attempt_at__isnull=True)
+        | Q(status__in=['Pending', 'Not_found', 'Failed'], next_attempt_at__lte=now())
+    )
+
+
+def claim_places_to_geocode(batch_size):
+    with transaction.atomic():
+        places = list(
+            get_places_to_geocode()
+            .select_for_update(skip_locked=True)
+            .order_by('saved_at')[:batch_size]
+        )
+        lease_expires_at = now() + timedelta(seconds=settings.GEOCODER_LEASE_TIMEOUT)
+        Place.objects.filter(id__in=[place.id for place in places]).update(next_attempt_at=lease_expires_at)
+    return places
+
+
+def geocode_pending_places(batch_size):
+    places = claim_places_to_geocode(batch_size)
+    if not places:
+        return 0
+
+    places_coordinates = fetch_places_coordinates([place.address for place in places])
+    for place in places:
+        place.attempts += 1
+        place.next_attempt_at = None
+        if place.address not in places_coordinates:
+            place.status = 'Failed'
+            place.next_attempt_at = get_next_attempt_at(place.attempts)
+        elif places_coordinates[place.address]:
+            place.lon, place.lat = places_coordinates[place.address]
+            place.status = 'Resolved'
+            place.attempts = 0
+        else:
+            place.status = 'Not_found'
+            place.next_attempt_at = get_next_attempt_at(place.attempts)
+    with transaction.atomic():
+        Place.objects.bulk_update(places, ['lon', 'lat', 'status', 'attempts', 'next_attempt_at'])
+        transaction.on_commit(lambda: places_geocoded.send(sender=Place, places=places))
+    return len(places)
+
+
+def get_geocoding_queue_stats():
+    pending_places = Place.objects.filter(status='Pending')
+    oldest_pending_at = pending_places.aggregate(oldest=Min('saved_at'))['oldest']
+    return {
+        'depth': pending_places.count(),
+        'lag': (now() - oldest_pending_at).total_seconds() if oldest_pending_at else 0,
+        'retries_due': get_places_to_geocode().exclude(status='Pending').count(),
+        'failed': Place.objects.filter(status__in=['Not_found', 'Failed']).count(),
+    }
+
+
+def get_places_coordinates(addresses):
+    normalized_addresses = {address: normalize_address(address) for address in addresses}
+    places = {}
+    for place in Place.objects.filter(normalized_address__in=set(normalized_addresses.values())):
+        if place.normalized_address not in places or place.status == 'Resolved':
+            places[place.normalized_address] = place
+
+    places_coordinates = {}
+    pending_places = set()
+    unknown_places = []
+    lookups = Counter()
+    for address, normalized_address in normalized_addresses.items():
+        place = places.get(normalized_address)
+        places_coordinates[address] = None
+        if not normalized_address:
+            continue
+        if not place:
+            unknown_places.append(address)
+            pending_places.add(address)
+            lookups['miss'] += 1
+        elif place.status == 'Resolved':
+            places_coordinates[address] = [place.lon, place.lat]
+            lookups['hit'] += 1
+        elif place.status == 'Pending':
+            pending_places.add(address)
+            lookups['pending'] += 1
         else:
-            serialized_places_and_coordinates[place] = places_and_coordinates[place]
+            lookups['not_found'] += 1
 
-    return serialized_places_and_coordinates
+    for result, lookups_count in lookups.items():
+        PLACES_LOOKUPS.labels(result).inc(lookups_count)
+    enqueue_addresses(unknown_places)
+    return places_coordinates, pending_places
@@ -0,0 +1,35 @@
+import warnings
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.timezone import now
+
+from foodcartapp.tests.fixtures import create_order
+
+
+class ExportOrdersTest(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('manager', is_staff=True))
+
+    def export_orders(self, registered_after):
+        return self.client.get(reverse('restaurateur:export_orders'), {'registered_after': registered_after})
+
+    def test_impossible_date_is_rejected(self):
+        response = self.export_orders('2024-13-01T00:00')
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_naive_date_is_made_aware(self):
+        create_order(total=Decimal('100'))
+        registered_after = (now() - timedelta(days=1)).replace(tzinfo=None).isoformat()
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', RuntimeWarning)
+            response = self.export_orders(registered_after)
+            content = b''.join(response.streaming_content)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Петров'.encode(), content)
@@ -0,0 +1,56 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils.timezone import now
+
+from foodcartapp.availability import get_availability_version
+from foodcartapp.board import bump_orders_version, get_orders_version
+from foodcartapp.models import Order, OrderItem
+from foodcartapp.tests.fixtures import create_order, create_restaurant_with_product
+
+
+@override_settings(ORDERS_BOARD_POLL_TIMEOUT=0, ORDERS_BOARD_CURSOR_OVERLAP=30)
+class ViewOrdersChangesTest(TestCase):
+    def setUp(self):
+        _, self.product = create_restaurant_with_product()
+        self.client.force_login(User.objects.create_user('manager', is_staff=True))
+
+    def create_order(self, updated_at):
+        order = create_order(total=Decimal('100'))
+        OrderItem.objects.create(order=order, product=self.product, quantity=1, price=Decimal('100'))
+        Order.objects.filter(id=order.id).update(updated_at=updated_at)
+        return order
+
+    def get_changes(self, cursor, orders_version):
+        return self.client.get(reverse('restaurateur:view_orders_changes'), {
+            'cursor': cursor,
+            'orders_version': orders_version,
+            'menu_version': get_availability_version(),
+        }).json()
+
+    def test_late_committed_order_is_returned(self):
+        cursor_updated_at = now()
+        cursor_order = self.create_order(cursor_updated_at)
+        cursor = f'{cursor_updated_at.isoformat()}_{cursor_order.id}'
+        seen_orders_version = get_orders_version()
+
+        late_order = self.create_order(cursor_updated_at - timedelta(seconds=5))
+        bump_orders_version()
+
+        changes = self.get_changes(cursor, seen_orders_version)
+
+        self.assertIn(late_order.id, [row['id'] for row in changes['rows']])
+        self.assertEqual(changes['cursor'], cursor)
+
+    def test_impossible_cursor_date_is_rejected(self):
+        response = self.client.get(reverse('restaurateur:view_orders_changes'), {
+            'cursor': '2024-13-45T00:00:00_5',
+            'orders_version': get_orders_version(),
+            'menu_version': get_availability_version(),
+        })
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('error', response.json())
@@ -0,0 +1,14 @@
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class ViewOrdersTest(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('manager', is_staff=True))
+
+    def test_impossible_cursor_date_shows_first_page(self):
+        response = self.client.get(reverse('restaurateur:view_orders'), {'after': '2024-13-45T00:00:00_5'})
+
+        self.assertEqual(response.status_code, 200)
@@ -13,6 +13,10 @@ urlpatterns = [
     path('restaurants/', views.view_restaurants, name="RestaurantView"),
 
     path('orders/', views.view_orders, name="view_orders"),
+    path('orders/export/', views.export_orders, name="export_orders"),
+    path('orders/changes/', views.view_orders_changes, name="view_orders_changes"),
+
+    path('stats/', views.view_request_stats, name="request_stats"),
 
     path('login/', views.LoginView.as_view(), name="login"),
     path('logout/', views.LogoutView.as_view(), name="logout"),
@@ -1,18 +1,30 @@
+from datetime import timedelta
+
 from django import forms
 from django.contrib.auth import authenticate, login
 from django.contrib.auth import views as auth_views
+from django.conf import settings
 from django.contrib.auth.decorators import user_passes_test
+from django.db.models import Q
 from django.shortcuts import redirect, render
-from django.urls import reverse_lazy
+from django.template.loader import render_to_string
+from django.urls import reverse, reverse_lazy
+from django.utils.dateparse import parse_datetime
+from django.utils.timezone import is_naive, make_aware, now
 from django.views import View
+from foodcartapp.availability import get_availability_index, get_availability_version
+from foodcartapp.board import get_orders_version, wait_for_orders_changes
+from foodcartapp.recommendations import get_orders_recommendations
+from foodcartapp.renderers import json_response
+from foodcartapp.streaming import StreamingJsonResponse
 from foodcartapp.models import (
     Order,
+    OrderItem,
     Product,
     Restaurant,
 )
-from geopy import distance
 
-from places.views import get_serialized_places_and_coordinates
+from star_burger.instrumentation import get_views_stats
 
 
 class Login(forms.Form):
@@ -70,16 +82,15 @@ def is_manager(user):
 @user_passes_test(is_manager, login_url='restaurateur:login')
 def view_products(request):
     restaurants = list(Restaurant.objects.order_by('name'))
-    products = list(Product.objects.prefetch_related('menu_items'))
+    products = list(Product.objects.select_related('category'))
+    availability_index = get_availability_index()
 
-    default_availability = {restaurant.id: False for restaurant in restaurants}
     products_with_restaurants = []
     for product in products:
-        availability = {
-            **default_availability,
-            **{item.restaurant_id: item.availability for item in product.menu_items.all()},
-        }
-        orders_availability = [availability[restaurant.id] for restaurant in restaurants]
+        orders_availability = [
+            availability_index.is_available(restaurant.id, product.id)
+            for restaurant in restaurants
+        ]
 
         products_with_restaurants.append(
             (product, orders_availability)
@@ -99,38 +110,305 @@ def view_restaurants(request):
 
 
 @user_passes_test(is_manager, login_url='restaurateur:login')
-def view_orders(request):
+def view_request_stats(request):
+    return json_response(request, get_views_stats())
+
+
+class OrdersFilter(forms.Form):
+    status = forms.ChoiceField(
+        label='Статус', required=False,
+        choices=[('', 'Все открытые'), *Order.STATUSES[:2]],
+        widget=forms.Select(attrs={'class': 'form-control'})
+    )
+    payment_option = forms.ChoiceField(
+        label='Способ оплаты', required=False,
+        choices=[('', 'Любой'), *Order.PAYMENT_OPTIONS],
+        widget=forms.Select(attrs={'class': 'form-control'})
+    )
+    restaurant = forms.ModelChoiceField(
+        label='Ресторан', required=False,
+        queryset=Restaurant.objects.order_by('name'),
+        empty_label='Любой',
+        widget=forms.Select(attrs={'class': 'form-control'})
+    )
+    min_total = forms.DecimalField(
+        label='Стоимость от', required=False, min_value=0,
+        widget=forms.NumberInput(attrs={'class': 'form-control'})
+    )
+    max_total = forms.DecimalField(
+        label='до', required=False, min_value=0,
+        widget=forms.NumberInput(attrs={'class': 'form-control'})
+    )
+
+
+def get_order_cursor(order):
+    return f'{order.registered_at.isoformat()}_{order.id}'
+
+
+def parse_order_cursor(cursor):
+    registered_at, _, order_id = (cursor or '').rpartition('_')
+    try:
+        registered_at = parse_datetime(registered_at) if registered_at else None
+    except ValueError:
+        return None
+    if not registered_at or not order_id.isdigit():
+        return None
+    return registered_at, int(order_id)
+
+
+def paginate_orders(orders, after, before, page_size):
+    if before:
+        registered_at, order_id = before
+        orders = orders.filter(
+            Q(registered_at__lt=registered_at) | Q(registered_at=registered_at, id__lt=order_id)
+        ).order_by('-registered_at', '-id')
+    elif after:
+        registered_at, order_id = after
+        orders = orders.filter(
+            Q(registered_at__gt=registered_at) | Q(registered_at=registered_at, id__gt=order_id)
+        ).order_by('registered_at', 'id')
+    else:
+        orders = orders.order_by('registered_at', 'id')
+
+    page_orders_ids = list(orders.values_list('id', flat=True)[:page_size + 1])
+    has_more = len(page_orders_ids) > page_size
+    page_orders_ids = page_orders_ids[:page_size]
+    has_previous = has_more if before else bool(after)
+    has_next = bool(before) or has_more
+    return page_orders_ids, has_previous, has_next
+
+
+def get_page_url(request, path=None, **params):
+    query = request.GET.copy()
+    query.pop('after', None)
+    query.pop('before', None)
+    query.update(params)
+    return f'{path or request.path}?{query.urlencode()}'
+
+
+def filter_orders(orders, orders_filter):
+    if not orders_filter.is_valid():
+        return orders
+    if orders_filter.cleaned_data['status']:
+        orders = orders.filter(status=orders_filter.cleaned_data['status'])
+    if orders_filter.cleaned_data['payment_option']:
+        orders = orders.filter(payment_option=orders_filter.cleaned_data['payment_option'])
+    if orders_filter.cleaned_data['restaurant']:
+        orders = orders.filter(responsible_restaurant=orders_filter.cleaned_data['restaurant'])
+    if orders_filter.cleaned_data['min_total'] is not None:
+        orders = orders.filter(total__gte=orders_filter.cleaned_data['min_total'])
+    if orders_filter.cleaned_data['max_total'] is not None:
+        orders = orders.filter(total__lte=orders_filter.cleaned_data['max_total'])
+    return orders
+
+
+def serialize_orders(orders_ids):
     serialized_orders = {}
-    db_orders = Order.objects.with_amount().with_are_able_to_cook_restaurants()
-    db_orders_addresses = [db_orders_address.address for db_orders_address in db_orders]
-    restaurant_addresses = [restaurant.address for restaurant in Restaurant.objects.all()]
-    serialized_places_and_coordinates = get_serialized_places_and_coordinates(
-        db_orders_addresses + restaurant_addresses)
+    db_orders = list(
+        Order.objects
+        .filter(id__in=orders_ids)
+        .select_related('responsible_restaurant')
+        .order_by('registered_at', 'id')
+    )
+    if not db_orders:
+        return serialized_orders
+
+    recommendations = get_orders_recommendations(db_orders)
+    restaurants = Restaurant.objects.in_bulk({
+        restaurant_id
+        for recommendation in recommendations.values()
+        for restaurant_id, _ in recommendation['restaurants']
+    })
     for order in db_orders:
-        restaurants_details = {}
-        for is_able_to_cook_restaurant in order.are_able_to_cook_restaurants:
-            if not serialized_places_and_coordinates[
-                order.address
-            ] or not serialized_places_and_coordinates[
-                is_able_to_cook_restaurant.address
-            ]:
-                restaurants_and_order_distance = 0
-            else:
-                restaurants_and_order_distance = round(
-                    distance.distance(
-                        serialized_places_and_coordinates[order.address],
-                        serialized_places_and_coordinates[is_able_to_cook_restaurant.address]
-                    ).km, 3)
-            restaurants_details[is_able_to_cook_restaurant] = restaurants_and_order_distance
-        sorted_restaurants_details = {
-            restaurant: restaurants_details[restaurant]
-            for restaurant in sorted(restaurants_details, key=restaurants_details.get)
-        }
+        recommendation = recommendations[order.id]
         serialized_orders[order] = {
-            'restaurants_details': sorted_restaurants_details,
-            'order_amount': order.amount
+            'restaurants_details': {
+                restaurants[restaurant_id]: distance
+                for restaurant_id, distance in recommendation['restaurants']
+                if restaurant_id in restaurants
+            },
+            'pending_restaurants': {
+                restaurants[restaurant_id]
+                for restaurant_id in recommendation['pending_restaurant_ids']
+                if restaurant_id in restaurants
+            },
+            'order_amount': order.total
         }
+    return serialized_orders
+
+
+def get_last_change_cursor():
+    last_change = Order.objects.order_by('-updated_at', '-id').values_list('updated_at', 'id').first()
+    updated_at, order_id = last_change or (now(), 0)
+    return f'{updated_at.isoformat()}_{order_id}'
+
+
+@user_passes_test(is_manager, login_url='restaurateur:login')
+def view_orders(request):
+    orders_version = get_orders_version()
+    menu_version = get_availability_version()
+    changes_cursor = get_last_change_cursor()
+
+    orders_filter = OrdersFilter(request.GET)
+    orders = filter_orders(Order.objects.open().with_available_menu_items(), orders_filter)
+    page_orders_ids, has_previous, has_next = paginate_orders(
+        orders,
+        after=parse_order_cursor(request.GET.get('after')),
+        before=parse_order_cursor(request.GET.get('before')),
+        page_size=settings.MANAGER_ORDERS_PAGE_SIZE,
+    )
+    serialized_orders = serialize_orders(page_orders_ids)
+    db_orders = list(serialized_orders)
 
     return render(request, template_name='order_items.html', context={
-        'orders': serialized_orders
+        'orders': serialized_orders,
+        'orders_filter': orders_filter,
+        'previous_page_url': get_page_url(
+            request, before=get_order_cursor(db_orders[0])
+        ) if has_previous and db_orders else None,
+        'next_page_url': get_page_url(
+            request, after=get_order_cursor(db_orders[-1])
+        ) if has_next and db_orders else None,
+        'next_url': request.get_full_path(),
+        'changes_url': get_page_url(
+            request,
+            path=reverse('restaurateur:view_orders_changes'),
+            cursor=changes_cursor,
+            orders_version=orders_version,
+            menu_version=menu_version,
+        ),
+    })
+
+
+@user_passes_test(is_manager, login_url='restaurateur:login')
+def view_orders_changes(request):
+    last_change = parse_order_cursor(request.GET.get('cursor'))
+    try:
+        seen_orders_version = int(request.GET.get('orders_version'))
+        menu_version = int(request.GET.get('menu_version'))
+    except (TypeError, ValueError):
+        last_change = None
+    if not last_change:
+        return json_response(request, {'error': 'Не указаны курсор, версии заказов и меню'}, status=400)
+    if menu_version != get_availability_version():
+        return json_response(request, {'reload': True})
+
+    orders_version = wait_for_orders_changes(
+        seen_orders_version,
+        timeout=settings.ORDERS_BOARD_POLL_TIMEOUT,
+        interval=settings.ORDERS_BOARD_POLL_INTERVAL,
+    )
+    cursor = request.GET['cursor']
+    changed_orders = list(
+        Order.objects
+        .changed_after(*last_change)
+        .values_list('id', 'updated_at')[:settings.MANAGER_ORDERS_PAGE_SIZE]
+    )
+    if changed_orders:
+        last_order_id, last_updated_at = changed_orders[-1]
+        cursor = f'{last_updated_at.isoformat()}_{last_order_id}'
+
+    late_orders_ids = []
+    if orders_version != seen_orders_version:
+        last_updated_at, _ = last_change
+        late_orders_ids = (
+            Order.objects
+            .filter(
+                updated_at__gt=last_updated_at - timedelta(seconds=settings.ORDERS_BOARD_CURSOR_OVERLAP),
+                updated_at__lte=last_updated_at,
+            )
+            .order_by('-updated_at')
+            .values_list('id', flat=True)[:settings.MANAGER_ORDERS_PAGE_SIZE]
+        )
+
+    pending_orders_ids = {
+        int(order_id) for order_id in request.GET.get('pending', '').split(',') if order_id.isdigit()
+    }
+    orders_ids = {order_id for order_id, _ in changed_orders} | set(late_orders_ids) | pending_orders_ids
+    orders_filter = OrdersFilter(request.GET)
+    shown_orders_ids = set(
+        filter_orders(Order.objects.open().with_available_menu_items(), orders_filter)
+        .filter(id__in=orders_ids)
+        .values_list('id', flat=True)
+    )
+    serialized_orders = serialize_orders(shown_orders_ids)
+    next_url = request.GET.get('next') or reverse('restaurateur:view_orders')
+    return json_response(request, {
+        'cursor': cursor,
+        'orders_version': orders_version,
+        'has_more': len(changed_orders) == settings.MANAGER_ORDERS_PAGE_SIZE,
+        'rows': [
+            {
+                'id': order.id,
+                'html': render_to_string(
+                    'order_row.html',
+                    {'order': order, 'order_detail': order_detail, 'next_url': next_url},
+                    request=request,
+                ),
+            }
+            for order, order_detail in serialized_orders.items()
+        ],
+        'removed': sorted(orders_ids - shown_orders_ids),
     })
+
+
+def serialize_exported_order(order, order_items):
+    return {
+        'id': order.id,
+        'status': order.status,
+        'payment_option': order.payment_option,
+        'firstname': order.firstname,
+        'lastname': order.lastname,
+        'phonenumber': str(order.phonenumber),
+        'address': order.address,
+        'comment': order.comment,
+        'registered_at': order.registered_at,
+        'called_at': order.called_at,
+        'delivered_at': order.delivered_at,
+        'total': order.total,
+        'responsible_restaurant': order.responsible_restaurant_id,
+        'products': order_items,
+    }
+
+
+def iter_exported_orders(orders, chunk_size):
+    last_order_id = 0
+    while True:
+        orders_chunk = list(orders.filter(id__gt=last_order_id).order_by('id')[:chunk_size])
+        if not orders_chunk:
+            return
+
+        orders_items = {}
+        order_items = (
+            OrderItem.objects
+            .filter(order__in=orders_chunk)
+            .order_by('id')
+            .values('order', 'product', 'quantity', 'price')
+        )
+        for order_item in order_items:
+            orders_items.setdefault(order_item.pop('order'), []).append(order_item)
+
+        for order in orders_chunk:
+            yield serialize_exported_order(order, orders_items.get(order.id, []))
+        last_order_id = orders_chunk[-1].id
+
+
+@user_passes_test(is_manager, login_url='restaurateur:login')
+def export_orders(request):
+    orders = Order.objects.all()
+    if request.GET.get('status'):
+        orders = orders.filter(status=request.GET['status'])
+    if request.GET.get('registered_after'):
+        try:
+            registered_after = parse_datetime(request.GET['registered_after'])
+        except ValueError:
+            registered_after = None
+        if not registered_after:
+            return json_response(request, {'error': 'Некорректная дата registered_after'}, status=400)
+        if is_naive(registered_after):
+            registered_after = make_aware(registered_after)
+        orders = orders.filter(registered_at__gte=registered_after)
+
+    response = StreamingJsonResponse(iter_exported_orders(orders, settings.ORDERS_EXPORT_CHUNK_SIZE))
+    response['Content-Disposition'] = 'attachment; filename="orders.json"'
+    return response
@@ -0,0 +1,90 @@
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_sequence, compress_string
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+BROTLI_QUALITY = 4
+
+
+def get_accepted_encodings(request):
+    accepted_encodings = set()
+    for accepted_encoding in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        encoding, _, params = accepted_encoding.partition(';')
+        _, _, quality = params.replace(' ', '').partition('q=')
+        try:
+            if quality and float(quality) == 0:
+                continue
+        except ValueError:
+            continue
+        accepted_encodings.add(encoding.strip().lower())
+    return accepted_encodings
+
+
+def get_response_encoding(request):
+    accepted_encodings = get_accepted_encodings(request)
+    if brotli is not None and 'br' in accepted_encodings:
+        return 'br'
+    if 'gzip' in accepted_encodings:
+        return 'gzip'
+    return None
+
+
+def compress(content, encoding, brotli_quality=BROTLI_QUALITY):
+    if encoding == 'br':
+        return brotli.compress(content, quality=brotli_quality)
+    return compress_string(content)
+
+
+def compress_brotli_sequence(sequence, quality=BROTLI_QUALITY):
+    compressor = brotli.Compressor(quality=quality)
+    for item in sequence:
+        data = compressor.process(item) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+def compress_streaming_content(streaming_content, encoding):
+    if encoding == 'br':
+        return compress_brotli_sequence(streaming_content)
+    return compress_sequence(streaming_content)
+
+
+class CompressionMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if response.has_header('Content-Encoding'):
+            return response
+        if not response.get('Content-Type', '').startswith('application/json'):
+            return response
+        if not response.streaming and len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = get_response_encoding(request)
+        if not encoding:
+            return response
+
+        if response.streaming:
+            response.streaming_content = compress_streaming_content(response.streaming_content, encoding)
+            del response['Content-Length']
+        else:
+            compressed_content = compress(response.content, encoding)
+            if len(compressed_content) >= len(response.content):
+                return response
+            response.content = compressed_content
+            response['Content-Length'] = str(len(compressed_content))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = f'W/{etag}'
+        response['Content-Encoding'] = encoding
+        return response
@@ -0,0 +1,160 @@
+import json
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+
+from .metrics import REQUEST_DB_DURATION, REQUEST_DURATION
+
+
+logger = logging.getLogger(__name__)
+
+_current_metrics = ContextVar('request_metrics', default=None)
+_views_timings = defaultdict(lambda: deque(maxlen=settings.REQUEST_STATS_SAMPLES))
+_views_timings_lock = threading.Lock()
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.counters = defaultdict(lambda: [0, 0.0])
+        self.lock = threading.Lock()
+
+    def add(self, name, duration):
+        with self.lock:
+            counter = self.counters[name]
+            counter[0] += 1
+            counter[1] += duration
+
+    def get(self, name):
+        count, duration = self.counters.get(name, (0, 0.0))
+        return count, duration * 1000
+
+
+@contextmanager
+def track(name):
+    metrics = _current_metrics.get()
+    if metrics is None:
+        yield
+        return
+
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.add(name, time.perf_counter() - started_at)
+
+
+@contextmanager
+def track_queries(metrics):
+    def track_query(execute, sql, params, many, context):
+        started_at = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            metrics.add('db', time.perf_counter() - started_at)
+
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(track_query))
+        yield
+
+
+def get_percentile(sorted_values, percent):
+    index = min(len(sorted_values) - 1, round(percent / 100 * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+def add_view_timing(view_name, timing):
+    with _views_timings_lock:
+        _views_timings[view_name].append(timing)
+
+
+def get_views_stats():
+    with _views_timings_lock:
+        views_timings = {view_name: list(timings) for view_name, timings in _views_timings.items()}
+
+    views_stats = {}
+    for view_name, timings in views_timings.items():
+        total_ms = sorted(timing['total_ms'] for timing in timings)
+        db_ms = sorted(timing['db_ms'] for timing in timings)
+        db_queries = [timing['db_queries'] for timing in timings]
+        views_stats[view_name] = {
+            'requests': len(timings),
+            'total_p50_ms': get_percentile(total_ms, 50),
+            'total_p90_ms': get_percentile(total_ms, 90),
+            'total_p99_ms': get_percentile(total_ms, 99),
+            'db_p50_ms': get_percentile(db_ms, 50),
+            'db_p90_ms': get_percentile(db_ms, 90),
+            'db_queries_mean': round(sum(db_queries) / len(db_queries), 1),
+            'db_queries_max': max(db_queries),
+            'geocoder_calls': sum(timing['geocoder_calls'] for timing in timings),
+        }
+    return views_stats
+
+
+class InstrumentationMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        token = _current_metrics.set(metrics)
+        started_at = time.perf_counter()
+        try:
+            with track_queries(metrics):
+                response = self.get_response(request)
+        finally:
+            _current_metrics.reset(token)
+
+        if response.streaming:
+            response.streaming_content = self.iter_streaming_content(
+                response.streaming_content,
+                request,
+                response,
+                metrics,
+                started_at,
+            )
+        else:
+            self.report(request, response, metrics, started_at)
+        return response
+
+    def iter_streaming_content(self, streaming_content, request, response, metrics, started_at):
+        try:
+            with track_queries(metrics):
+                yield from streaming_content
+        finally:
+            self.report(request, response, metrics, started_at)
+
+    def report(self, request, response, metrics, started_at):
+        total_ms = (time.perf_counter() - started_at) * 1000
+        db_queries, db_ms = metrics.get('db')
+        geocoder_calls, geocoder_ms = metrics.get('geocoder')
+        resolver_match = getattr(request, 'resolver_match', None)
+        view_name = resolver_match.view_name if resolver_match else 'unresolved'
+        timing = {
+            'view': view_name,
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'total_ms': round(total_ms, 2),
+            'db_queries': db_queries,
+            'db_ms': round(db_ms, 2),
+            'geocoder_calls': geocoder_calls,
+            'geocoder_ms': round(geocoder_ms, 2),
+        }
+        add_view_timing(view_name, timing)
+        REQUEST_DURATION.labels(view_name, request.method).observe(total_ms / 1000)
+        REQUEST_DB_DURATION.labels(view_name).observe(db_ms / 1000)
+        logger.info(json.dumps(timing, ensure_ascii=False))
+
+        if settings.SERVER_TIMING_HEADER and not response.streaming:
+            response['Server-Timing'] = ', '.join([
+                f'db;dur={db_ms:.1f};desc="{db_queries} queries"',
+                f'geocoder;dur={geocoder_ms:.1f};desc="{geocoder_calls} calls"',
+                f'total;dur={total_ms:.1f}',
+            ])
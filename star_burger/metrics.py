@@ -0,0 +1,124 @@
+import hmac
+import ipaddress
+import os
+
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.db.models import Count
+from django.http import HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+
+
+REQUEST_DURATION = Histogram(
+    'star_burger_request_duration_seconds',
+    'Время ответа на запрос',
+    ['view', 'method'],
+    buckets=[0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10],
+)
+REQUEST_DB_DURATION = Histogram(
+    'star_burger_request_db_duration_seconds',
+    'Время запросов к БД за один запрос к сайту',
+    ['view'],
+    buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5],
+)
+ORDERS_REGISTERED = Counter(
+    'star_burger_orders_registered_total',
+    'Принятые заказы',
+    ['endpoint', 'mode'],
+)
+ORDER_STATUS_TRANSITIONS = Counter(
+    'star_burger_order_status_transitions_total',
+    'Смены статуса заказа',
+    ['from_status', 'to_status'],
+)
+ORDER_CALL_DELAY = Histogram(
+    'star_burger_order_call_delay_seconds',
+    'Время от регистрации заказа до звонка клиенту',
+    buckets=[30, 60, 120, 300, 600, 900, 1800, 3600, 7200, 14400],
+)
+PLACES_LOOKUPS = Counter(
+    'star_burger_places_lookups_total',
+    'Поиск координат адресов в базе мест: hit - координаты известны, pending - ждут геокодера, '
+    'not_found - геокодер не нашёл адрес, miss - адрес поставлен в очередь впервые',
+    ['result'],
+)
+ORDER_RECOMMENDATIONS_CACHE = Counter(
+    'star_burger_order_recommendations_cache_total',
+    'Обращения к кэшу подходящих ресторанов для заказов: hit - взяты из кэша, miss - посчитаны заново',
+    ['result'],
+)
+
+
+class OpenOrdersCollector:
+    def describe(self):
+        yield self.get_metric()
+
+    def collect(self):
+        from foodcartapp.models import Order
+
+        open_orders = self.get_metric()
+        orders_count_by_status = dict.fromkeys([status for status, _ in Order.STATUSES[:2]], 0)
+        orders_count_by_status.update(
+            Order.objects
+            .open()
+            .order_by()
+            .values('status')
+            .annotate(orders_count=Count('id'))
+            .values_list('status', 'orders_count')
+        )
+        for status, orders_count in orders_count_by_status.items():
+            open_orders.add_metric([status], orders_count)
+        yield open_orders
+
+    def get_metric(self):
+        return GaugeMetricFamily(
+            'star_burger_open_orders',
+            'Необработанные и взятые в работу заказы',
+            labels=['status'],
+        )
+
+
+def get_registry():
+    if 'PROMETHEUS_MULTIPROC_DIR' not in os.environ:
+        return REGISTRY
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    registry.register(OpenOrdersCollector())
+    return registry
+
+
+def is_allowed_ip(request):
+    remote_addr = request.META.get('REMOTE_ADDR', '')
+    if remote_addr not in settings.METRICS_ALLOWED_IPS:
+        return False
+    try:
+        return not ipaddress.ip_address(remote_addr).is_loopback
+    except ValueError:
+        return False
+
+
+def has_metrics_token(request):
+    if not settings.METRICS_TOKEN:
+        return False
+    scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+    return scheme.lower() == 'bearer' and hmac.compare_digest(token.strip(), settings.METRICS_TOKEN)
+
+
+def view_metrics(request):
+    if not (request.user.is_staff or has_metrics_token(request) or is_allowed_ip(request)):
+        raise PermissionDenied
+    return HttpResponse(generate_latest(get_registry()), content_type=CONTENT_TYPE_LATEST)
+
+
+if 'PROMETHEUS_MULTIPROC_DIR' not in os.environ:
+    REGISTRY.register(OpenOrdersCollector())
@@ -34,6 +34,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'star_burger.instrumentation.InstrumentationMiddleware',
+    'star_burger.compression.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -89,6 +91,22 @@ DATABASES = {
     'default': env.dj_db_url('POSTGRES_URL')
 }
 
+CACHES = {
+    'default': env.dj_cache_url('CACHE_URL', 'locmem://'),
+    'versions': env.dj_cache_url('VERSIONS_CACHE_URL', env.str('CACHE_URL', 'locmem://versions')),
+}
+CATALOGUE_CACHE_TIMEOUT = env.int('CATALOGUE_CACHE_TIMEOUT', 24 * 60 * 60)
+CATALOGUE_CACHE_MAX_SIZE = env.int('CATALOGUE_CACHE_MAX_SIZE', 10 * 1024 * 1024)
+CATALOGUE_QUERY_CHUNK_SIZE = 2000
+
+JSON_ENGINE = env.str('JSON_ENGINE', 'orjson')
+REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'foodcartapp.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -115,6 +133,8 @@ USE_L10N = True
 USE_TZ = True
 
 STATIC_URL = '/static/'
+STATICFILES_STORAGE = 'star_burger.storage.CompressedManifestStaticFilesStorage'
+COMPRESSION_MIN_SIZE = env.int('COMPRESSION_MIN_SIZE', 1024)
 
 INTERNAL_IPS = [
     '127.0.0.1'
@@ -131,6 +151,47 @@ LOGIN_REDIRECT_URL = '/api/order/'
 PHONENUMBER_DEFAULT_REGION = 'RU'
 PHONENUMBER_DB_FORMAT = "NATIONAL"
 YA_API_KEY = env('YA_API_KEY')
+YA_GEOCODER_URL = env.str('YA_GEOCODER_URL', 'https://geocode-maps.yandex.ru/1.x')
+GEOCODER_TIMEOUT = env.float('GEOCODER_TIMEOUT', 5)
+GEOCODER_MAX_WORKERS = env.int('GEOCODER_MAX_WORKERS', 10)
+GEOCODER_RETRY_DELAY = env.int('GEOCODER_RETRY_DELAY', 10 * 60)
+GEOCODER_MAX_RETRY_DELAY = env.int('GEOCODER_MAX_RETRY_DELAY', 7 * 24 * 60 * 60)
+GEOCODER_LEASE_TIMEOUT = env.int('GEOCODER_LEASE_TIMEOUT', 5 * 60)
+DISTANCE_METHOD = env.str('DISTANCE_METHOD', 'haversine')
+NEAREST_RESTAURANTS_COUNT = env.int('NEAREST_RESTAURANTS_COUNT', 5)
+NEAREST_RESTAURANTS_RADIUS = env.float('NEAREST_RESTAURANTS_RADIUS', 50)
+ORDER_RECOMMENDATIONS_CACHE_TIMEOUT = env.int('ORDER_RECOMMENDATIONS_CACHE_TIMEOUT', 24 * 60 * 60)
+MANAGER_ORDERS_PAGE_SIZE = env.int('MANAGER_ORDERS_PAGE_SIZE', 50)
+ORDERS_BOARD_POLL_TIMEOUT = env.int('ORDERS_BOARD_POLL_TIMEOUT', 10)
+ORDERS_BOARD_POLL_INTERVAL = env.float('ORDERS_BOARD_POLL_INTERVAL', 1)
+ORDERS_BOARD_CURSOR_OVERLAP = env.int('ORDERS_BOARD_CURSOR_OVERLAP', 30)
+ORDERS_EXPORT_CHUNK_SIZE = 2000
+ORDERS_BATCH_MAX_SIZE = env.int('ORDERS_BATCH_MAX_SIZE', 1000)
+IDEMPOTENCY_KEY_TTL = env.int('IDEMPOTENCY_KEY_TTL', 24 * 60 * 60)
+ORDER_INTAKE_MODE = env.str('ORDER_INTAKE_MODE', 'sync')
+ORDER_AUTO_ASSIGNMENT = env.bool('ORDER_AUTO_ASSIGNMENT', False)
+
+SERVER_TIMING_HEADER = env.bool('SERVER_TIMING_HEADER', True)
+REQUEST_STATS_SAMPLES = env.int('REQUEST_STATS_SAMPLES', 1000)
+METRICS_ALLOWED_IPS = env.list('METRICS_ALLOWED_IPS', [])
+METRICS_TOKEN = env.str('METRICS_TOKEN', '')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'star_burger.instrumentation': {
+            'handlers': ['console'],
+            'level': env.str('REQUEST_LOG_LEVEL', 'WARNING'),
+            'propagate': False,
+        },
+    },
+}
 
 ROLLBAR_POST_SERVER_TOKEN = env('ROLLBAR_POST_SERVER_TOKEN')
 ROLLBAR_ENV = env('ROLLBAR_ENV')
@@ -0,0 +1,48 @@
+import os
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+from .compression import brotli, compress
+
+
+COMPRESSED_EXTENSIONS = ('.js', '.css', '.svg', '.json', '.txt', '.html', '.xml')
+STATIC_BROTLI_QUALITY = 11
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    encodings = {'gzip': '.gz', 'br': '.br'}
+
+    def post_process(self, *args, **kwargs):
+        yield from super().post_process(*args, **kwargs)
+        if kwargs.get('dry_run'):
+            return
+
+        for hashed_name in set(self.hashed_files.values()):
+            for compressed_name in self.compress_file(hashed_name):
+                yield hashed_name, compressed_name, True
+
+    def get_encodings(self):
+        return [encoding for encoding in self.encodings if encoding != 'br' or brotli is not None]
+
+    def compress_file(self, name):
+        if os.path.splitext(name)[1] not in COMPRESSED_EXTENSIONS:
+            return
+        if self.size(name) < settings.COMPRESSION_MIN_SIZE:
+            return
+
+        content = None
+        for encoding in self.get_encodings():
+            compressed_name = f'{name}{self.encodings[encoding]}'
+            if self.exists(compressed_name):
+                continue
+            if content is None:
+                with self.open(name) as original_file:
+                    content = original_file.read()
+
+            compressed_content = compress(content, encoding, brotli_quality=STATIC_BROTLI_QUALITY)
+            if len(compressed_content) >= len(content):
+                continue
+            self._save(compressed_name, ContentFile(compressed_content))
+            yield compressed_name